@@ -68,13 +68,15 @@ def upload_data():
         # Validate file using FileHandler
         file_info = FileHandler.validate_file(file)
         
-        # Read file content
-        file_content = file.read()
+        # Hand the spooled upload to the parser as a buffer instead of reading it into bytes
+        file.stream.seek(0)
         
-        # Process file with CSVProcessor
+        # Process file with CSVProcessor; categorical value counts are capped at the
+        # top values unless the client asks for the full distribution
         from app.core.analytics import CSVProcessor
-        processor = CSVProcessor()
-        result = processor.process_upload(file_content, file_info['filename'])
+        full_distribution = request.args.get('full_distribution', 'false').lower() == 'true'
+        processor = CSVProcessor(full_value_counts=full_distribution)
+        result = processor.process_upload(file.stream, file_info['filename'])
         
         if result['success']:
             return jsonify({
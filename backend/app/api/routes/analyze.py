@@ -3,6 +3,7 @@ Analyze API routes for file processing (Phase 2).
 """
 
 from flask import Blueprint, request, jsonify
+from app.core.analytics import CSVProcessor
 from app.services.llm_service import LLMService
 from app.utils.file_handler import FileHandler
 from config.settings import settings
@@ -15,12 +16,34 @@ import time
 analyze_bp = Blueprint('analyze', __name__)
 llm_service = LLMService()
 
+# fileIDs with a background job in flight. Duplicate uploads resolve to the same
+# fileID, so a repeated /run must not start a second job for it.
+_processing_lock = threading.Lock()
+_processing_ids = set()
+
 
 def _process_file_background(fileID: str, file_metadata: dict):
     """Background processing function."""
     try:
+        # Profile the upload; the cleaned frame goes to the dataset cache for previews and chart queries
+        result = CSVProcessor().process_upload(
+            FileHandler.map_upload(fileID), f"{fileID}.{file_metadata['ext']}", file_id=fileID,
+            source_path=FileHandler.get_upload_path(fileID, file_metadata['ext'])
+        )
+        if result['success']:
+            dataset_summary = {
+                'rows': result['metadata']['rows_processed'],
+                'columns': [str(col) for col in result['column_analysis']],
+                'cached': result['metadata'].get('dataset_cached', False),
+            }
+        else:
+            print(f"Dataset profiling failed for fileID {fileID}: {'; '.join(result['errors'])}")
+            dataset_summary = None
+
         # Process file with LLM service
         processed_data = llm_service.process_file(fileID, file_metadata)
+        if dataset_summary:
+            processed_data['dataset'] = dataset_summary
         
         # Save processed data to file-storage/processed/<fileID>.json
         processed_path = os.path.join(settings.FILE_PROCESSED_DIR, f"{fileID}.json")
@@ -40,6 +63,9 @@ def _process_file_background(fileID: str, file_metadata: dict):
         processed_path = os.path.join(settings.FILE_PROCESSED_DIR, f"{fileID}.json")
         with open(processed_path, 'w', encoding='utf-8') as f:
             json.dump(error_data, f, ensure_ascii=False, indent=2)
+    finally:
+        with _processing_lock:
+            _processing_ids.discard(fileID)
 
 
 @analyze_bp.route('/run', methods=['POST'])
@@ -76,7 +102,21 @@ def run_analysis():
         if not os.path.exists(upload_path):
             return jsonify({'success': False, 'error': 'Upload file not found'}), 404
         
-        # Start background processing
+        # Start background processing unless a job for this fileID is already running
+        with _processing_lock:
+            already_running = fileID in _processing_ids
+            _processing_ids.add(fileID)
+        if already_running:
+            return jsonify({
+                'success': True,
+                'data': {
+                    'success': True,
+                    'fileID': fileID,
+                    'status': 'processing',
+                    'message': 'File is being processed'
+                }
+            }), 200
+        
         thread = threading.Thread(
             target=_process_file_background,
             args=(fileID, file_metadata),
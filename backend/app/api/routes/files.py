@@ -4,10 +4,14 @@ Files API routes for upload, listing, deletion, and preview (Phase 1).
 
 from flask import Blueprint, request, jsonify, Response
 from werkzeug.utils import secure_filename
+from app.utils.buffers import open_buffer
+from app.utils.compression import CompressedBuffer
+from app.utils.dataset_cache import DatasetCache
+from app.utils.excel_reader import ExcelReader
 from app.utils.file_handler import FileHandler
+from app.utils.json_reader import JSONReader
 from config.settings import settings
 import os
-import json
 import pandas as pd
 
 
@@ -26,24 +30,44 @@ def upload_file():
 
         # Validate type and size using existing utility
         info = FileHandler.validate_file(file)
+        ext = info['extension']
+
+        # Stage the file while hashing it, then reuse an identical stored upload if there is one
+        temp_path, content_hash = FileHandler.stage_upload(file)
+        existing = FileHandler.find_upload_by_hash(content_hash) if settings.UPLOAD_DEDUP_ENABLED else None
+        if existing and existing.get('ext') == ext:
+            os.remove(temp_path)
+            fileID = existing['fileID']
+            print(f"File ID: {fileID} (duplicate upload)")
+            processed_path = os.path.join(settings.FILE_PROCESSED_DIR, f"{fileID}.json")
+            return jsonify({
+                'success': True,
+                'fileID': fileID,
+                'filename': existing['filename'],
+                'size': existing['size'],
+                'ext': ext,
+                'deduplicated': True,
+                'processed': os.path.exists(processed_path),
+            }), 200
 
         fileID = FileHandler.generate_file_id()
         print(f"File ID: {fileID}")
-        ext = info['extension']
-        upload_path = FileHandler.get_upload_path(fileID, ext)
-
-        # Persist file to storage
-        file.seek(0)
-        file.save(upload_path)
+        FileHandler.commit_upload(temp_path, fileID, ext)
 
         metadata = {
             'fileID': fileID,
             'filename': info['filename'],
             'ext': ext,
             'size': info['size'],
+            'content_hash': content_hash,
             'created_at': pd.Timestamp.utcnow().isoformat(),
         }
+        if info.get('compression'):
+            metadata['compression'] = info['compression']
+            metadata['uncompressed_size'] = info['uncompressed_size']
         FileHandler.save_upload_metadata(fileID, metadata)
+        if settings.UPLOAD_DEDUP_ENABLED:
+            FileHandler.register_content_hash(content_hash, fileID)
 
         return jsonify({
             'success': True,
@@ -51,6 +75,7 @@ def upload_file():
             'filename': info['filename'],
             'size': info['size'],
             'ext': ext,
+            'deduplicated': False,
         }), 200
 
     except ValueError as e:
@@ -106,6 +131,40 @@ def _render_html_table_from_dataframe(df: pd.DataFrame, title: str) -> str:
     return html
 
 
+@files_bp.route('/raw/<fileID>', methods=['GET'])
+def download_raw_file(fileID: str):
+    """Stream the stored upload from its memory mapping, honouring single HTTP Range requests."""
+    try:
+        try:
+            meta = FileHandler.get_upload_metadata(fileID)
+            mapping = FileHandler.map_upload(fileID)
+        except FileNotFoundError:
+            return jsonify({'success': False, 'error': 'File not found'}), 404
+
+        length = mapping.nbytes
+        headers = {
+            'Accept-Ranges': 'bytes',
+            'Content-Disposition': f"attachment; filename={meta.get('filename', fileID)}",
+        }
+        byte_range = request.range
+        if byte_range is None:
+            headers['Content-Length'] = str(length)
+            return Response(FileHandler.iter_upload_range(mapping), status=200,
+                            mimetype='application/octet-stream', headers=headers)
+
+        bounds = byte_range.range_for_length(length)
+        if bounds is None:
+            headers['Content-Range'] = f"bytes */{length}"
+            return Response(status=416, headers=headers)
+        start, stop = bounds
+        headers['Content-Range'] = f"bytes {start}-{stop - 1}/{length}"
+        headers['Content-Length'] = str(stop - start)
+        return Response(FileHandler.iter_upload_range(mapping, start, stop), status=206,
+                        mimetype='application/octet-stream', headers=headers)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @files_bp.route('/preview/<fileID>', methods=['GET'])
 def preview_file(fileID: str):
     try:
@@ -120,35 +179,33 @@ def preview_file(fileID: str):
         if not os.path.exists(path):
             return Response("<h3>File not found</h3>", status=404, mimetype='text/html')
 
-        # Render HTML preview
+        # Prefer the cleaned dataset cache once analysis has filled it; never parse the whole upload here
+        try:
+            df = DatasetCache.load(fileID, source_path=path, nrows=20)
+        except Exception:
+            df = None
+        if df is not None:
+            return Response(_render_html_table_from_dataframe(df, filename), status=200, mimetype='text/html')
+
+        # Render HTML preview; compressed uploads are inflated only as far as the preview reads
+        source, ext = FileHandler.open_upload_source(fileID)
         if ext == 'csv':
-            df = pd.read_csv(path)
+            df = pd.read_csv(open_buffer(source), nrows=20)
             html = _render_html_table_from_dataframe(df, filename)
         elif ext in ['xlsx', 'xls']:
-            df = pd.read_excel(path)
+            if isinstance(source, CompressedBuffer):
+                source = source.read_all()
+            df = ExcelReader.read_sheet(source, request.args.get('sheet'), nrows=20, extension=ext)
             html = _render_html_table_from_dataframe(df, filename)
-        elif ext == 'json':
+        elif ext in ['json', 'jsonl', 'ndjson']:
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                # Convert to DataFrame sensibly
-                if isinstance(data, list):
-                    df = pd.DataFrame(data)
-                elif isinstance(data, dict):
-                    # If dict of lists, DataFrame will expand; else show key/value pairs
-                    try:
-                        df = pd.DataFrame(data)
-                        if df.empty:
-                            df = pd.DataFrame(list(data.items()), columns=['key', 'value'])
-                    except Exception:
-                        df = pd.DataFrame(list(data.items()), columns=['key', 'value'])
-                else:
-                    df = pd.DataFrame({'value': [str(data)]})
+                # Only the first records are decoded; nested objects become dotted columns
+                df = JSONReader.read(source, nrows=20, extension=ext)
                 html = _render_html_table_from_dataframe(df, filename)
             except Exception as e:
                 return Response(f"<h3>Error reading JSON: {str(e)}</h3>", status=400, mimetype='text/html')
         else:
-            return Response("<h3>Invalid file type. Supported: CSV, XLSX, XLS, JSON</h3>", status=400, mimetype='text/html')
+            return Response("<h3>Invalid file type. Supported: CSV, XLSX, XLS, JSON, JSONL</h3>", status=400, mimetype='text/html')
 
         return Response(html, status=200, mimetype='text/html')
     except Exception as e:
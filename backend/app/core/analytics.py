@@ -7,22 +7,93 @@ import numpy as np
 import chardet
 import regex as re
 from datetime import datetime
-from dateutil import parser
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Union, BinaryIO
+import codecs
+import csv
 import io
 import time
 import os
 import json
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from app.core.column_stats import ColumnAccumulator, ColumnProfile, top_counts
+from app.core.sampling import ReservoirSample
+from app.utils.buffers import as_memoryview, open_buffer
+from app.utils.compression import CompressedBuffer, DecompressionLimitError, split_extension
+from app.utils.dataset_cache import DatasetCache
+from app.utils.excel_reader import ExcelReader
+from app.utils.file_handler import FileHandler
+from app.utils.json_reader import ORJSON_AVAILABLE, JSONReader
+from app.utils.memory import PeakMemoryTracker
+from app.utils.profile_checkpoint import ProfileCheckpoint
+from app.utils.shared_memory import SharedArray
+from config.settings import settings
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # Configuration constants
 ENCODINGS_TO_TRY = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
 SEPARATORS_TO_TRY = [',', ';', '\t', '|', '|']
+SNIFF_SAMPLE_SIZE = 256 * 1024  # Bytes inspected to pick encoding and dialect
+SNIFF_MAX_LINES = 200  # Lines used to score delimiter consistency
+UTF8_COMPATIBLE_ENCODINGS = {'utf-8', 'utf-8-sig', 'ascii'}
+PARSE_ENGINES = ('pandas', 'pyarrow')
+ANALYSIS_EXECUTORS = ('thread', 'process')
+# Processor attributes that change column_analysis, copied to process-pool workers
+ANALYSIS_OPTIONS = ('full_value_counts', 'exact_statistics')
+# Statistics sampled profiling can still compute on every row, and the column type each one belongs to
+EXACT_STATISTICS = ('missing', 'cardinality', 'numeric', 'value_counts', 'dates')
+TYPE_STATISTICS = {'numeric': 'numeric', 'categorical': 'value_counts', 'date': 'dates'}
+# Missing-value strategies per column kind; 'none' leaves the gaps in place
+IMPUTE_STRATEGIES = {
+    'numeric': ('median', 'mean', 'zero', 'none'),
+    'categorical': ('mode', 'constant', 'none'),
+}
 DATE_FORMATS = [
     '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y',
     '%B %d, %Y', '%b %d, %Y',
     '%d-%m-%Y', '%Y/%m/%d',
     '%m-%d-%Y', '%d/%m/%y'
 ]
+# Timestamps with times or UTC offsets fall back to pandas' ISO 8601 parser
+DATE_FALLBACK_FORMAT = 'ISO8601'
+DATE_SAMPLE_SIZE = 100  # Values used to pick a column's date format
+DATE_MATCH_THRESHOLD = 0.9  # Share of values a format must parse to be accepted
+CORRELATION_SAMPLE_ROWS = 100000  # Rows used to rank column pairs for scatter and line suggestions
+CATEGORY_SAMPLE_SIZE = 10000  # Rows checked for an early cardinality bound before encoding
+NUMERIC_SAMPLE_SIZE = 200  # Values inspected before attempting numeric coercion of a text column
+NUMERIC_GATE_THRESHOLD = 0.4  # Expected share of convertible rows below which coercion is skipped
+CURRENCY_SYMBOLS = '$€£¥₹'
+NUMERIC_LIKE_PATTERN = re.compile(r"^\s*[-+]?\s*[$€£¥₹]?\s*[-+]?\d[\d.,\s\u00a0'’]*%?\s*$")
+# Numeric-looking identifiers, per decimal separator: zero-padded codes (007), '+' followed by
+# grouped digits (+44 20 7946 0000), or space/apostrophe grouping other than strict 3-digit
+# groups (555 123 4567; 1 234 567 and 1'234.5 are numbers). A bare leading '+' is a sign.
+NUMERIC_IDENTIFIER_PATTERNS = {
+    decimal: re.compile(r"^\s*(?:[-+]?\s*[$€£¥₹]?\s*[-+]?0\d|\+\s*\d+[\s'’]+\d|(?=.*\d[\s'’]+\d)"
+                        r"(?!-?\s*[$€£¥₹]?\s*\d{1,3}(?:[ '’\u00a0]\d{3})+(?:" + separator + r"\d+)?\s*%?\s*$))")
+    for decimal, separator in (('.', r'\.'), (',', ','))
+}
+NUMERIC_IDENTIFIER_THRESHOLD = 0.1  # Share of identifier-like sample values that keeps a column as text
+THOUSANDS_COMMA_PATTERN = re.compile(r'^\D*\d{1,3}(,\d{3})+(\.\d*)?\D*$')  # 1,234.5
+DECIMAL_COMMA_PATTERN = re.compile(r'^\D*\d+([.\s\u00a0]\d{3})*,\d+\D*$')  # 1.234,5 / 12,5
+# One translation per decimal separator: drop symbols and grouping, normalize the decimal point
+NUMERIC_TRANSLATIONS = {
+    '.': str.maketrans('', '', CURRENCY_SYMBOLS + ",%'’ \u00a0"),
+    ',': str.maketrans({',': '.', **{char: None for char in CURRENCY_SYMBOLS + ".%'’ \u00a0"}}),
+}
+# Candidate integer dtypes for downcasting, smallest first (numpy, nullable)
+INTEGER_DOWNCAST_TYPES = [
+    (np.int8, 'Int8'), (np.int16, 'Int16'), (np.int32, 'Int32'), (np.int64, 'Int64')
+]
+# Spellings of a two-valued flag column ({True, False} after hash-equal folding of 1 and 0)
+BOOLEAN_VALUES = frozenset({'True', 'False', True, False, 1, 0})
 BUSINESS_KEYWORDS = {
     'revenue': ['revenue', 'sales', 'income', 'amount', 'price', 'total'],
     'customers': ['customer', 'user', 'client', 'account', 'member'],
@@ -38,6 +109,10 @@ def convert_numpy_types(obj):
         return float(obj)
     elif isinstance(obj, np.ndarray):
         return obj.tolist()
+    elif isinstance(obj, datetime):
+        return obj.isoformat()
+    elif isinstance(obj, np.datetime64):
+        return None if np.isnat(obj) else pd.Timestamp(obj).isoformat()
     elif isinstance(obj, dict):
         return {key: convert_numpy_types(value) for key, value in obj.items()}
     elif isinstance(obj, list):
@@ -49,14 +124,59 @@ def convert_numpy_types(obj):
 class CSVProcessor:
     """Advanced CSV processor for handling real-world messy data."""
     
-    def __init__(self):
+    def __init__(self, parse_engine: Optional[str] = None, arrow_dtypes: Optional[bool] = None,
+                 optimize_dtypes: Optional[bool] = None, impute_strategies: Optional[Dict[str, str]] = None,
+                 analysis_workers: Optional[int] = None, analysis_executor: Optional[str] = None,
+                 approximate: Optional[bool] = None, full_value_counts: bool = False,
+                 sampling: Optional[bool] = None, sample_size: Optional[int] = None,
+                 sample_seed: Optional[int] = None, exact_statistics: Optional[List[str]] = None):
         self.data_cache = {}
         self.processing_stats = {}
+        self.parse_engine = parse_engine or settings.CSV_PARSE_ENGINE
+        if self.parse_engine not in PARSE_ENGINES:
+            raise ValueError(f"Unknown parse engine '{self.parse_engine}'. Choose from: {', '.join(PARSE_ENGINES)}")
+        self.arrow_dtypes = settings.CSV_ARROW_DTYPES if arrow_dtypes is None else arrow_dtypes
+        self.optimize_dtypes = settings.OPTIMIZE_DTYPES if optimize_dtypes is None else optimize_dtypes
+        self.impute_strategies = {
+            'numeric': settings.IMPUTE_NUMERIC_STRATEGY,
+            'categorical': settings.IMPUTE_CATEGORICAL_STRATEGY,
+            **(impute_strategies or {})
+        }
+        self.approximate = approximate  # None: decided per dataset by settings.APPROXIMATE_MIN_ROWS
+        self.full_value_counts = full_value_counts
+        self.sampling = settings.PROFILE_SAMPLING if sampling is None else sampling
+        self.sample_size = sample_size or settings.PROFILE_SAMPLE_SIZE
+        self.sample_seed = settings.PROFILE_SAMPLE_SEED if sample_seed is None else sample_seed
+        self.exact_statistics = frozenset(
+            settings.PROFILE_EXACT_STATISTICS if exact_statistics is None else exact_statistics
+        )
+        unknown = self.exact_statistics.difference(EXACT_STATISTICS)
+        if unknown:
+            raise ValueError(f"Unknown exact statistics: {', '.join(sorted(unknown))}. "
+                             f"Choose from: {', '.join(EXACT_STATISTICS)}")
+        self.analysis_workers = analysis_workers or settings.COLUMN_ANALYSIS_WORKERS
+        self.analysis_executor = analysis_executor or settings.COLUMN_ANALYSIS_EXECUTOR
+        if self.analysis_executor not in ANALYSIS_EXECUTORS:
+            raise ValueError(f"Unknown analysis executor '{self.analysis_executor}'. "
+                             f"Choose from: {', '.join(ANALYSIS_EXECUTORS)}")
+        for kind, strategy in self.impute_strategies.items():
+            if strategy not in IMPUTE_STRATEGIES.get(kind, ()):
+                choices = ', '.join(IMPUTE_STRATEGIES.get(kind, ()))
+                raise ValueError(f"Unknown {kind} imputation strategy '{strategy}'. Choose from: {choices}")
     
-    def process_upload(self, file_content: bytes, filename: str) -> Dict[str, Any]:
+    def process_upload(self, file_content: Union[bytes, memoryview, BinaryIO], filename: str,
+                       streaming: Optional[bool] = None, file_id: Optional[str] = None,
+                       source_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Main entry point for processing uploaded files.
         
+        `file_content` may be bytes, a memoryview or a binary file object; it is
+        handed to the parsers as a memoryview so the upload is never copied whole.
+        Uploads of at least settings.STREAMING_MIN_FILE_SIZE bytes are profiled in
+        streaming mode unless `streaming` is passed explicitly. When `file_id` is given,
+        the cleaned DataFrame of an in-memory run is saved to the dataset cache, with
+        the size and mtime of the stored upload at `source_path` for cheap freshness checks.
+        
         Returns:
         {
             'success': bool,
@@ -64,10 +184,23 @@ class CSVProcessor:
             'metadata': {
                 'encoding': str,
                 'separator': str,
+                'dialect': Dict[str, Any],
+                'sniff_time': float,
                 'rows_processed': int,
                 'columns_processed': int,
                 'cleaning_applied': List[str],
-                'processing_time': float
+                'processing_time': float,
+                'peak_memory': Dict[str, float],
+                'stage_memory': Dict[str, Dict],  # in-memory mode, per cleaning stage
+                'date_formats': Dict[str, str],  # strptime format (or 'ISO8601') per date column
+                'approximate': bool,  # column statistics come from sketches (always in streaming mode)
+                'dataset_cached': bool,  # in-memory mode: the cleaned frame was saved for `file_id`
+                'incremental': Dict[str, int],  # streamed appends to a checkpointed upload only
+                'sampling': Dict[str, Any],  # sampled profiling only: sample size, seed and exact statistics
+                'row_partitions': int,  # row partitions (or streamed chunks) profiled on a process pool only
+                'sheets': List[Dict],  # Excel only, with the analyzed 'sheet_name'
+                'compression': str,  # gzip/zstd/zip uploads only
+                'memory_optimization': Dict[str, Any]  # when optimize_dtypes is on
             },
             'column_analysis': Dict[str, Dict],
             'data_quality': Dict[str, Any],
@@ -78,55 +211,27 @@ class CSVProcessor:
         }
         """
         start_time = time.time()
-        errors = []
         warnings = []
+        self.processing_stats = {}
         
         try:
-            # Smart file reading
-            df = self._smart_read_file(file_content, filename)
-            
-            # Clean and normalize data
-            df = self._clean_and_normalize(df)
-            
-            # Analyze columns
-            column_analysis = self._analyze_columns(df)
-            
-            # Detect business metrics
-            business_metrics = self._detect_business_metrics(column_analysis)
-            
-            # Suggest visualizations
-            visualization_suggestions = self._suggest_visualizations(column_analysis, business_metrics)
-            
-            # Assess data quality
-            data_quality = self._assess_data_quality(df, column_analysis)
-            
-            processing_time = time.time() - start_time
-            
-            # Convert DataFrame to serializable preview
-            data_preview = df.head(10).to_dict('records') if not df.empty else []
-            
-            result = {
-                'success': True,
-                'data_preview': data_preview,
-                'metadata': {
-                    'encoding': self.processing_stats.get('encoding', 'unknown'),
-                    'separator': self.processing_stats.get('separator', 'unknown'),
-                    'rows_processed': len(df),
-                    'columns_processed': len(df.columns),
-                    'cleaning_applied': self.processing_stats.get('cleaning_applied', []),
-                    'processing_time': processing_time
-                },
-                'column_analysis': column_analysis,
-                'data_quality': data_quality,
-                'visualization_suggestions': visualization_suggestions,
-                'business_insights': business_metrics,
-                'errors': errors,
-                'warnings': warnings
-            }
-            
-            # Convert numpy types to Python native types for JSON serialization
-            result = convert_numpy_types(result)
+            with PeakMemoryTracker() as memory_tracker:
+                buffer = as_memoryview(file_content)
+                if streaming is None:
+                    streaming = self._uncompressed_size(buffer, filename) >= settings.STREAMING_MIN_FILE_SIZE
+                if streaming:
+                    result = self._process_upload_streaming(buffer, filename, start_time)
+                else:
+                    result = self._process_upload_in_memory(buffer, filename, start_time, file_id, source_path)
             
+            result['metadata']['peak_memory'] = memory_tracker.report()
+            if 'sheets' in self.processing_stats:
+                result['metadata']['sheet_name'] = self.processing_stats['sheet_name']
+                result['metadata']['sheets'] = self.processing_stats['sheets']
+            if 'compression' in self.processing_stats:
+                result['metadata']['compression'] = self.processing_stats['compression']
+            if 'memory_optimization' in self.processing_stats:
+                result['metadata']['memory_optimization'] = self.processing_stats['memory_optimization']
             return result
             
         except Exception as e:
@@ -143,14 +248,84 @@ class CSVProcessor:
                 'warnings': warnings
             }
     
+    def _process_upload_in_memory(self, file_content: memoryview, filename: str, start_time: float,
+                                  file_id: Optional[str] = None, source_path: Optional[str] = None) -> Dict[str, Any]:
+        """Load the whole upload into one DataFrame, then clean, analyze and score it."""
+        errors = []
+        warnings = []
+        
+        # Smart file reading
+        df = self._smart_read_file(file_content, filename)
+        
+        # Clean and normalize data
+        df = self._clean_and_normalize(df)
+        
+        # Cache the cleaned, typed frame so later readers skip parsing and cleaning
+        dataset_cached = False
+        if file_id:
+            dataset_cached = DatasetCache.save(file_id, df, DatasetCache.hash_buffer(file_content),
+                                               source_path=source_path) is not None
+        
+        # Analyze columns
+        column_analysis = self._analyze_columns(df)
+        
+        # Detect business metrics
+        business_metrics = self._detect_business_metrics(column_analysis)
+        
+        # Suggest visualizations
+        visualization_suggestions = self._suggest_visualizations(column_analysis, business_metrics, df)
+        
+        # Assess data quality
+        data_quality = self._assess_data_quality(df, column_analysis)
+        
+        processing_time = time.time() - start_time
+        
+        # Convert DataFrame to serializable preview
+        data_preview = df.head(10).to_dict('records') if not df.empty else []
+        
+        result = {
+            'success': True,
+            'data_preview': data_preview,
+            'metadata': {
+                'encoding': self.processing_stats.get('encoding', 'unknown'),
+                'separator': self.processing_stats.get('separator', 'unknown'),
+                'dialect': self.processing_stats.get('dialect', {}),
+                'sniff_time': self.processing_stats.get('sniff_time', 0.0),
+                'parse_engine': self.processing_stats.get('parse_engine', 'pandas'),
+                'rows_processed': len(df),
+                'columns_processed': len(df.columns),
+                'cleaning_applied': self.processing_stats.get('cleaning_applied', []),
+                'processing_time': processing_time,
+                'stage_memory': self.processing_stats.get('stage_memory', {}),
+                'date_formats': self.processing_stats.get('date_formats', {}),
+                'approximate': self.processing_stats.get('approximate', False),
+                'dataset_cached': dataset_cached
+            },
+            'column_analysis': column_analysis,
+            'data_quality': data_quality,
+            'visualization_suggestions': visualization_suggestions,
+            'business_insights': business_metrics,
+            'errors': errors,
+            'warnings': warnings
+        }
+        
+        if 'sampling' in self.processing_stats:
+            result['metadata']['sampling'] = self.processing_stats['sampling']
+        if 'row_partitions' in self.processing_stats:
+            result['metadata']['row_partitions'] = self.processing_stats['row_partitions']
+        
+        # Convert numpy types to Python native types for JSON serialization
+        result = convert_numpy_types(result)
+        
+        return result
+    
     def upload_and_process(self, filepath: str) -> Dict[str, Any]:
         """Convenience wrapper: read a file from disk and return a simplified result for tests."""
         if not os.path.isfile(filepath):
             raise FileNotFoundError(f"File not found: {filepath}")
         filename = os.path.basename(filepath)
         with open(filepath, 'rb') as f:
-            content = f.read()
-        result = self.process_upload(content, filename)
+            result = self.process_upload(f, filename)
         if not result.get('success'):
             return {
                 'data_preview': None,
@@ -170,30 +345,272 @@ class CSVProcessor:
             'processing_stats': result['metadata']
         }
     
-    def _smart_read_file(self, file_content: bytes, filename: str) -> pd.DataFrame:
+    def load_dataset(self, fileID: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Return the cleaned, typed DataFrame for a stored upload.
+        
+        Served from the columnar dataset cache when it matches the upload's content
+        hash; otherwise the upload is parsed and cleaned once and the cache rebuilt.
+        """
+        meta = FileHandler.get_upload_metadata(fileID)
+        source_path = FileHandler.get_upload_path(fileID, meta['ext'])
+        if not os.path.exists(source_path):
+            raise FileNotFoundError("Upload file not found")
+        
+        df = DatasetCache.load(fileID, columns=columns, source_path=source_path)
+        if df is not None:
+            return df
+        
+        buffer = FileHandler.map_upload(fileID)
+        df = self._clean_and_normalize(self._smart_read_file(buffer, f"{fileID}.{meta['ext']}"))
+        DatasetCache.save(fileID, df, DatasetCache.hash_buffer(buffer), source_path=source_path)
+        return df[columns] if columns is not None else df
+    
+    def _uncompressed_size(self, file_content: memoryview, filename: str) -> int:
+        """Size of the data once inflated, as declared by the compression container."""
+        compression = split_extension(filename)[1]
+        if compression:
+            hint = CompressedBuffer(file_content, compression).size_hint()
+            if hint is not None:
+                return max(hint, file_content.nbytes)
+        return file_content.nbytes
+    
+    def _resolve_source(self, file_content: memoryview, filename: str):
+        """
+        Split a compression suffix off the filename and wrap compressed bytes so
+        parsers inflate them as a stream. Returns (source, data file extension).
+        """
+        file_extension, compression = split_extension(filename)
+        if not compression:
+            return file_content, file_extension
+        
+        self.processing_stats['compression'] = compression
+        source = CompressedBuffer(file_content, compression, max_size=FileHandler.MAX_FILE_SIZE)
+        if not file_extension:
+            file_extension = source.data_extension
+        if file_extension in ['xlsx', 'xls']:
+            # Workbooks need random access
+            return source.read_all(), file_extension
+        return source, file_extension
+    
+    def _smart_read_file(self, file_content: memoryview, filename: str) -> pd.DataFrame:
         """
         Intelligently read file with automatic encoding and separator detection.
         """
-        file_extension = filename.split('.')[-1].lower()
+        file_content, file_extension = self._resolve_source(file_content, filename)
         
         if file_extension == 'csv':
             return self._read_csv_smart(file_content)
         elif file_extension in ['xlsx', 'xls']:
-            return self._read_excel_smart(file_content)
-        elif file_extension == 'json':
-            return self._read_json_smart(file_content)
+            return self._read_excel_smart(file_content, file_extension)
+        elif file_extension in ['json', 'jsonl', 'ndjson']:
+            return self._read_json_smart(file_content, file_extension)
         else:
             raise ValueError(f"Unsupported file type: {file_extension}")
     
-    def _read_csv_smart(self, file_content: bytes) -> pd.DataFrame:
-        """Smart CSV reading with encoding and separator detection."""
-        # Detect encoding
-        detected_encoding = chardet.detect(file_content)['encoding']
+    def _read_csv_smart(self, file_content: memoryview) -> pd.DataFrame:
+        """
+        Smart CSV reading: sniff the dialect from a sample, then parse the full file once.
+        """
+        dialect = self._sniff_csv_dialect(file_content)
+        
+        try:
+            try:
+                df = self._parse_csv(file_content, dialect)
+            except UnicodeDecodeError:
+                # Non-UTF-8 bytes beyond the sniffed sample; cp1252 covers most such exports
+                dialect['encoding'] = 'cp1252' if dialect['encoding'].startswith('utf-8') else 'latin-1'
+                df = self._parse_csv(file_content, dialect)
+        except DecompressionLimitError:
+            raise
+        except (pd.errors.ParserError, csv.Error, ValueError):
+            df = None
+        
+        if df is None or (len(df.columns) <= 1 and dialect['field_count'] > 1):
+            return self._read_csv_fallback(file_content)
+        
+        self._record_dialect(dialect)
+        return df
+    
+    def _record_dialect(self, dialect: Dict[str, Any]) -> None:
+        self.processing_stats['encoding'] = dialect['encoding']
+        self.processing_stats['separator'] = dialect['delimiter']
+        self.processing_stats['dialect'] = {
+            key: dialect[key] for key in ('delimiter', 'quotechar', 'quoting', 'header_row', 'has_header')
+        }
+    
+    def _sniff_csv_dialect(self, file_content: memoryview) -> Dict[str, Any]:
+        """Pick encoding, delimiter, quoting and header row from the head of the file."""
+        sniff_start = time.time()
+        # One byte past the sample tells whether the file continues
+        sample = bytes(file_content[:SNIFF_SAMPLE_SIZE + 1])
+        truncated = len(sample) > SNIFF_SAMPLE_SIZE
+        sample = sample[:SNIFF_SAMPLE_SIZE]
+        
+        encoding = self._detect_sample_encoding(sample, truncated)
+        text = sample.decode(encoding, errors='ignore')
+        if truncated and '\n' in text:
+            # Drop the partial last line so it cannot skew field counts
+            text = text[:text.rfind('\n') + 1]
+        lines = text.splitlines()[:SNIFF_MAX_LINES]
+        
+        delimiter, quotechar, field_count, header_row = self._detect_delimiter(lines)
+        has_header = self._detect_header(
+            [line for line in lines[header_row:] if line.strip()], delimiter, quotechar
+        )
+        
+        self.processing_stats['sniff_time'] = time.time() - sniff_start
+        return {
+            'encoding': encoding,
+            'delimiter': delimiter,
+            'quotechar': quotechar,
+            'quoting': 'minimal',
+            'header_row': header_row,
+            'has_header': has_header,
+            'field_count': field_count
+        }
+    
+    def _detect_sample_encoding(self, sample: bytes, truncated: bool) -> str:
+        """Detect encoding on a byte sample, preferring UTF-8 when the sample is valid UTF-8."""
+        if sample.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        try:
+            # Incremental decoder tolerates a multi-byte character cut at the sample boundary
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=not truncated)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+        
+        detected_encoding = chardet.detect(sample)['encoding']
+        encodings_to_try = [detected_encoding] + ENCODINGS_TO_TRY if detected_encoding else ENCODINGS_TO_TRY
+        for encoding in encodings_to_try:
+            try:
+                sample.decode(encoding)
+                return encoding
+            except (UnicodeDecodeError, LookupError):
+                continue
+        return 'latin-1'
+    
+    def _detect_delimiter(self, lines: List[str]) -> tuple:
+        """
+        Score each candidate separator by how consistently it splits the sample lines.
+        
+        Returns (delimiter, quotechar, field_count, header_row) where header_row is the
+        number of preamble lines (titles, blank lines) to skip before the table starts.
+        """
+        quotechar = '"'
+        try:
+            sniffed = csv.Sniffer().sniff('\n'.join(lines), delimiters=''.join(dict.fromkeys(SEPARATORS_TO_TRY)))
+            if sniffed.quotechar in ('"', "'"):
+                quotechar = sniffed.quotechar
+        except csv.Error:
+            sniffed = None
+        
+        best = (',', 1, 0)
+        best_score = (-1.0, 0)
+        for separator in dict.fromkeys(SEPARATORS_TO_TRY):
+            counts = [len(row) for row in csv.reader(lines, delimiter=separator, quotechar=quotechar)]
+            table_counts = [count for count in counts if count > 1]
+            if not table_counts:
+                continue
+            modal_count = max(set(table_counts), key=table_counts.count)
+            consistency = table_counts.count(modal_count) / len(counts)
+            score = (consistency, modal_count)
+            if sniffed is not None and sniffed.delimiter == separator:
+                # Break ties in favour of the stdlib sniffer's choice
+                score = (consistency + 1e-6, modal_count)
+            if score > best_score:
+                best_score = score
+                # Leading single-field lines are a title/preamble block, not the header
+                header_row = next(i for i, count in enumerate(counts) if count > 1)
+                best = (separator, modal_count, header_row)
+        
+        delimiter, field_count, header_row = best
+        return delimiter, quotechar, field_count, header_row
+    
+    def _detect_header(self, lines: List[str], delimiter: str, quotechar: str) -> bool:
+        """Treat the first row as a header unless it is all numeric and the stdlib sniffer agrees."""
+        if len(lines) < 2:
+            return True
+        first_row = [cell for cell in next(csv.reader(lines[:1], delimiter=delimiter, quotechar=quotechar)) if cell.strip()]
+        if not first_row or not all(self._looks_numeric(cell) for cell in first_row):
+            return True
+        try:
+            return csv.Sniffer().has_header('\n'.join(lines))
+        except csv.Error:
+            return True
+    
+    @staticmethod
+    def _looks_numeric(value: str) -> bool:
+        try:
+            float(value.strip().replace(',', ''))
+            return True
+        except ValueError:
+            return False
+    
+    def _parse_csv(self, file_content: memoryview, dialect: Dict[str, Any], **read_kwargs) -> pd.DataFrame:
+        """Parse the full file once with the sniffed dialect."""
+        self.processing_stats['parse_engine'] = 'pandas'
+        if self.parse_engine == 'pyarrow' and 'chunksize' not in read_kwargs:
+            if not PYARROW_AVAILABLE:
+                self.processing_stats['parse_engine_fallback'] = 'pyarrow is not installed'
+            else:
+                try:
+                    df = self._parse_csv_arrow(file_content, dialect)
+                    self.processing_stats['parse_engine'] = 'pyarrow'
+                    return df
+                except Exception as e:
+                    # Arrow rejects some files pandas accepts (ragged rows, odd quoting)
+                    self.processing_stats['parse_engine_fallback'] = f"{type(e).__name__}: {e}"
+        
+        encoding_errors = read_kwargs.pop('encoding_errors', 'strict')
+        return pd.read_csv(
+            self._open_csv_source(file_content, dialect['encoding'], encoding_errors),
+            sep=dialect['delimiter'],
+            quotechar=dialect['quotechar'],
+            encoding=dialect['encoding'],
+            encoding_errors=encoding_errors,
+            skiprows=dialect['header_row'],
+            header=0 if dialect['has_header'] else None,
+            **read_kwargs
+        )
+    
+    def _open_csv_source(self, file_content: memoryview, encoding: str, errors: str = 'strict'):
+        """
+        Reader over the upload buffer for the C parser. UTF-8-compatible input is
+        passed as bytes and decoded natively by the parser; anything else goes through
+        an incremental text wrapper, so no full decoded copy of the file is built.
+        """
+        reader = open_buffer(file_content)
+        if codecs.lookup(encoding).name in UTF8_COMPATIBLE_ENCODINGS:
+            return reader
+        return io.TextIOWrapper(reader, encoding=encoding, errors=errors, newline='')
+    
+    def _parse_csv_arrow(self, file_content: memoryview, dialect: Dict[str, Any]) -> pd.DataFrame:
+        """Parse with the multithreaded Arrow CSV reader, optionally keeping Arrow-backed dtypes."""
+        read_kwargs = {'dtype_backend': 'pyarrow'} if self.arrow_dtypes else {}
+        # Arrow reads the binary buffer block by block and transcodes non-UTF-8 input itself
+        return pd.read_csv(
+            open_buffer(file_content),
+            engine='pyarrow',
+            sep=dialect['delimiter'],
+            quotechar=dialect['quotechar'],
+            encoding=dialect['encoding'],
+            skiprows=dialect['header_row'],
+            header=0 if dialect['has_header'] else None,
+            **read_kwargs
+        )
+    
+    def _read_csv_fallback(self, file_content: memoryview) -> pd.DataFrame:
+        """Brute-force encoding and separator search, used only when sniffing fails."""
+        if isinstance(file_content, CompressedBuffer):
+            file_content = file_content.read_all()
+        detected_encoding = chardet.detect(bytes(file_content[:SNIFF_SAMPLE_SIZE]))['encoding']
         encodings_to_try = [detected_encoding] + ENCODINGS_TO_TRY if detected_encoding else ENCODINGS_TO_TRY
         
         for encoding in encodings_to_try:
             try:
-                content_str = file_content.decode(encoding)
+                content_str = str(file_content, encoding)
                 self.processing_stats['encoding'] = encoding
                 
                 # Try different separators
@@ -202,70 +619,270 @@ class CSVProcessor:
                         df = pd.read_csv(io.StringIO(content_str), sep=separator)
                         if len(df.columns) > 1:  # Valid separator found
                             self.processing_stats['separator'] = separator
+                            self.processing_stats['dialect'] = {
+                                'delimiter': separator,
+                                'quotechar': '"',
+                                'quoting': 'minimal',
+                                'header_row': 0,
+                                'has_header': True,
+                                'fallback': True
+                            }
                             return df
                     except:
                         continue
                         
-            except UnicodeDecodeError:
+            except (UnicodeDecodeError, LookupError):
                 continue
         
         raise ValueError("Could not read CSV file with any encoding or separator combination")
     
-    def _read_excel_smart(self, file_content: bytes) -> pd.DataFrame:
-        """Smart Excel reading with sheet detection."""
+    def _read_excel_smart(self, file_content: memoryview, file_extension: str = 'xlsx') -> pd.DataFrame:
+        """
+        Smart Excel reading: probe the first rows of every sheet in parallel, then
+        stream only the first non-empty one through a read-only engine. All sheets
+        are listed in the metadata.
+        """
         try:
-            df = pd.read_excel(io.BytesIO(file_content))
-            self.processing_stats['encoding'] = 'excel'
-            self.processing_stats['separator'] = 'excel'
-            return df
+            sheets = ExcelReader.survey_sheets(file_content, file_extension)
+            if not sheets:
+                raise ValueError("workbook has no sheets")
+            sheet = next((sheet for sheet in sheets if sheet['rows'] != 0), sheets[0])
+            df = ExcelReader.read_sheet(file_content, sheet['name'], extension=file_extension)
         except Exception as e:
             raise ValueError(f"Could not read Excel file: {str(e)}")
+
+        sheet['rows'], sheet['columns'] = len(df), len(df.columns)
+        self._record_excel_stats(file_extension, sheet['name'], sheets)
+        return df
+
+    def _record_excel_stats(self, file_extension: str, sheet_name: str, sheets: List[Dict[str, Any]]) -> None:
+        self.processing_stats['encoding'] = 'excel'
+        self.processing_stats['separator'] = 'excel'
+        self.processing_stats['parse_engine'] = ExcelReader.engine(file_extension)
+        self.processing_stats['sheet_name'] = sheet_name
+        self.processing_stats['sheets'] = sheets
     
-    def _read_json_smart(self, file_content: bytes) -> pd.DataFrame:
-        """Smart JSON reading with normalization."""
+    def _read_json_smart(self, file_content: memoryview, file_extension: str = 'json') -> pd.DataFrame:
+        """Smart JSON reading: incremental array/JSON Lines decoding with nested objects flattened."""
         try:
-            content_str = file_content.decode('utf-8')
-            df = pd.read_json(io.StringIO(content_str))
-            self.processing_stats['encoding'] = 'utf-8'
-            self.processing_stats['separator'] = 'json'
-            return df
+            df = JSONReader.read(file_content, extension=file_extension)
         except Exception as e:
             raise ValueError(f"Could not read JSON file: {str(e)}")
+        self._record_json_stats(file_content, file_extension)
+        return df
+    
+    def _record_json_stats(self, file_content: memoryview, file_extension: str) -> None:
+        self.processing_stats['encoding'] = 'utf-8'
+        self.processing_stats['separator'] = 'json'
+        self.processing_stats['json_format'] = JSONReader.detect_format(file_content, file_extension)
+        self.processing_stats['parse_engine'] = 'orjson' if ORJSON_AVAILABLE else 'json'
     
     def _clean_and_normalize(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Clean and normalize the DataFrame.
+        
+        The pipeline owns the freshly read frame and mutates it in place: columns
+        are replaced one at a time only when a stage changes them, empty and
+        duplicate rows are removed with a single row take, and masks are released
+        as soon as they have been applied. Peak resident memory of every stage is
+        recorded in processing_stats['stage_memory'].
         """
         cleaning_applied = []
+        self.processing_stats['stage_memory'] = {}
         
-        # Remove completely empty rows and columns
-        initial_rows, initial_cols = df.shape
-        df = df.dropna(how='all').dropna(axis=1, how='all')
-        if df.shape != (initial_rows, initial_cols):
-            cleaning_applied.append("removed_empty_rows_columns")
+        # Find completely empty rows and columns; the rows go in the deduplication take below
+        with self._track_stage('drop_empty'):
+            present = df.notna()
+            non_empty_rows = present.any(axis=1).to_numpy()
+            empty_columns = [col for col, has_values in present.any(axis=0).items() if not has_values]
+            del present
+            for col in empty_columns:
+                del df[col]
+            if empty_columns or not non_empty_rows.all():
+                cleaning_applied.append("removed_empty_rows_columns")
         
         # Clean column names
         df.columns = [self._clean_column_name(col) for col in df.columns]
         cleaning_applied.append("cleaned_column_names")
         
         # Convert string numbers to numeric
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                df[col] = self._convert_string_numbers(df[col])
+        with self._track_stage('convert_numbers'):
+            for col in df.columns:
+                if self._is_text_dtype(df[col].dtype):
+                    converted = self._convert_string_numbers(df[col])
+                    if converted is not df[col]:
+                        df[col] = converted
+                    del converted
         
-        # Remove duplicate rows
-        initial_rows = len(df)
-        df = df.drop_duplicates()
-        if len(df) < initial_rows:
-            cleaning_applied.append("removed_duplicate_rows")
+        # Parse date columns once with one explicit format per column
+        with self._track_stage('parse_dates'):
+            date_formats = self._parse_date_columns(df)
+        self.data_cache['date_formats'] = date_formats
+        self.processing_stats['date_formats'] = date_formats
+        if date_formats:
+            cleaning_applied.append("parsed_date_columns")
         
-        # Handle missing values
-        df = self._handle_missing_values(df)
+        # Store low-cardinality text columns as categoricals (integer codes)
+        with self._track_stage('encode_categoricals'):
+            categorical_columns = self._encode_categoricals(df)
+        if categorical_columns:
+            cleaning_applied.append("encoded_categorical_columns")
+        
+        # Remove empty and duplicate rows in one take, keeping the row hashes of the survivors
+        with self._track_stage('deduplicate'):
+            row_hashes = self._row_hashes(df)
+            keep = non_empty_rows.copy()
+            duplicated = pd.Index(row_hashes[keep]).duplicated()
+            keep[keep] = ~duplicated
+            if duplicated.any():
+                cleaning_applied.append("removed_duplicate_rows")
+            rows_removed = not keep.all()
+            if rows_removed:
+                df = df.take(np.flatnonzero(keep))
+                row_hashes = row_hashes[keep]
+            del keep, duplicated, non_empty_rows
+        
+        # Handle missing values; only imputed rows change, so only those are rehashed
+        with self._track_stage('handle_missing_values'):
+            incomplete = df.isna().any(axis=1).to_numpy()
+            df = self._handle_missing_values(df)
+            if incomplete.any():
+                row_hashes[incomplete] = self._row_hashes(df[incomplete])
+            del incomplete
         cleaning_applied.append("handled_missing_values")
+        self.data_cache['row_hashes'] = row_hashes
+        
+        # Categories of rows removed above would otherwise show up with zero counts
+        if rows_removed:
+            for col in categorical_columns:
+                df[col] = df[col].cat.remove_unused_categories()
+        
+        if self.optimize_dtypes:
+            with self._track_stage('optimize_dtypes'):
+                df = self._optimize_dtypes(df)
+            cleaning_applied.append("optimized_dtypes")
         
         self.processing_stats['cleaning_applied'] = cleaning_applied
         return df
     
+    @contextmanager
+    def _track_stage(self, stage: str):
+        """Record the peak resident memory of one cleaning stage in processing_stats."""
+        with PeakMemoryTracker() as tracker:
+            yield
+        self.processing_stats.setdefault('stage_memory', {})[stage] = tracker.report()
+    
+    def _optimize_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Downcast each column to the smallest dtype that holds its values exactly and
+        record memory_usage(deep=True) before and after in processing_stats.
+        """
+        before = df.memory_usage(deep=True, index=False)
+        changed = {}
+        for col in df.columns:
+            optimized = self._downcast_series(df[col])
+            if optimized.dtype != df[col].dtype:
+                changed[col] = {'from': str(df[col].dtype), 'to': str(optimized.dtype)}
+                df[col] = optimized
+        after = df.memory_usage(deep=True, index=False)
+        
+        before_bytes, after_bytes = int(before.sum()), int(after.sum())
+        self.processing_stats['memory_optimization'] = {
+            'before_bytes': before_bytes,
+            'after_bytes': after_bytes,
+            'saved_bytes': before_bytes - after_bytes,
+            'saved_percent': round((1 - after_bytes / before_bytes) * 100, 1) if before_bytes else 0.0,
+            'columns': {
+                col: {**change, 'before_bytes': int(before[col]), 'after_bytes': int(after[col])}
+                for col, change in changed.items()
+            }
+        }
+        return df
+    
+    @staticmethod
+    def _downcast_series(series: pd.Series) -> pd.Series:
+        """
+        Smallest exact dtype for one column: narrower integers, float32 when every
+        value round-trips, nullable integers for whole-number floats with gaps, and
+        the nullable boolean dtype for True/False columns, whether still object or
+        already encoded as a True/False categorical.
+        """
+        dtype = series.dtype
+        if dtype == object:
+            if pd.api.types.infer_dtype(series, skipna=True) == 'boolean':
+                return series.astype('boolean')
+            return series
+        if isinstance(dtype, pd.CategoricalDtype):
+            if len(dtype.categories) and pd.api.types.infer_dtype(dtype.categories) == 'boolean':
+                return series.astype('boolean')
+            return series
+        if not isinstance(dtype, np.dtype) or dtype.kind not in 'iuf':
+            return series
+        
+        values = series.to_numpy()
+        missing = np.isnan(values) if dtype.kind == 'f' else None
+        present = values[~missing] if missing is not None else values
+        if len(present) == 0:
+            return series
+        
+        if dtype.kind in 'iu' or np.array_equal(present, np.trunc(present)):
+            low, high = present.min(), present.max()
+            nullable = missing is not None and missing.any()
+            for numpy_type, nullable_type in INTEGER_DOWNCAST_TYPES:
+                info = np.iinfo(numpy_type)
+                if info.min <= low and high <= info.max:
+                    target = nullable_type if nullable else numpy_type
+                    return series if target == dtype else series.astype(target)
+        
+        if dtype == np.float64:
+            narrowed = values.astype(np.float32)
+            if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+                return pd.Series(narrowed, index=series.index, name=series.name)
+        return series
+    
+    def _encode_categoricals(self, df: pd.DataFrame) -> List[str]:
+        """
+        Convert text columns below the cardinality thresholds to category dtype in
+        place, factorizing each column once. Returns the converted column names.
+        """
+        converted = []
+        for col in df.columns:
+            values = df[col]
+            if not self._is_text_dtype(values.dtype):
+                continue
+            non_null = values.count()
+            if non_null == 0:
+                continue
+            # A sample that already exceeds the limit rules the column out cheaply
+            if len(values) > CATEGORY_SAMPLE_SIZE and values.iloc[:CATEGORY_SAMPLE_SIZE].nunique() > settings.CATEGORY_MAX_UNIQUE:
+                continue
+            try:
+                codes, categories = pd.factorize(values, sort=True)
+            except TypeError:
+                # Mixed types that cannot be ordered keep first-seen order
+                codes, categories = pd.factorize(values)
+            if len(categories) > settings.CATEGORY_MAX_UNIQUE or len(categories) / non_null > settings.CATEGORY_MAX_UNIQUE_RATIO:
+                continue
+            df[col] = pd.Categorical.from_codes(codes, categories=categories)
+            converted.append(col)
+        return converted
+    
+    @staticmethod
+    def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+        """
+        Vectorized 64-bit hash of every row's values, ignoring the index. Equal rows
+        hash equally, so duplicate detection and row-level change detection can
+        compare these instead of the rows themselves.
+        """
+        if len(df.columns) == 0:
+            return np.zeros(len(df), dtype=np.uint64)
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+    
+    @staticmethod
+    def _is_text_dtype(dtype) -> bool:
+        """True for Python-object and string dtypes, including Arrow-backed strings."""
+        return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+    
     def _clean_column_name(self, col_name: str) -> str:
         """Clean column name by converting to lowercase and replacing spaces with underscores."""
         if not isinstance(col_name, str):
@@ -273,140 +890,523 @@ class CSVProcessor:
         return re.sub(r'[^a-zA-Z0-9_]', '_', col_name.lower().replace(' ', '_'))
     
     def _convert_string_numbers(self, series: pd.Series) -> pd.Series:
-        """Convert string numbers to numeric, handling currency and percentage symbols."""
-        # Remove currency symbols and commas
-        cleaned = series.astype(str).str.replace(r'[\$,]', '', regex=True)
-        # Remove percentage symbols and convert to decimal
-        cleaned = cleaned.str.replace(r'%$', '', regex=True)
-        
-        # Try to convert to numeric
-        try:
-            numeric_series = pd.to_numeric(cleaned, errors='coerce')
-            if numeric_series.notna().sum() > len(series) * 0.5:  # More than 50% converted
-                return numeric_series
-        except:
-            pass
+        """Convert string numbers to numeric, handling currency, percentage, grouping and decimal commas."""
+        decimal = self._infer_numeric_format(series)
+        if decimal is None:
+            return series
         
+        numeric_series = self._parse_numeric_strings(series, decimal)
+        if numeric_series.notna().sum() > len(series) * 0.5:  # More than 50% converted
+            return numeric_series
         return series
     
+    def _infer_numeric_format(self, series: pd.Series) -> Optional[str]:
+        """
+        Decide from a sample whether a text column could be numeric. Returns its
+        decimal separator ('.' or ','), or None when the full parse can be skipped
+        or the sample looks like phone numbers or zero-padded codes.
+        """
+        values = series.dropna()
+        if len(values) > NUMERIC_SAMPLE_SIZE:
+            positions = np.linspace(0, len(values) - 1, NUMERIC_SAMPLE_SIZE).astype(np.intp)
+            sample = values.iloc[positions]
+        else:
+            sample = values
+        if len(sample) == 0:
+            return None
+        
+        matches = [value for value in map(str, sample) if NUMERIC_LIKE_PATTERN.match(value)]
+        # Share of all rows expected to convert: non-null share times numeric-looking share
+        if (len(values) / len(series)) * (len(matches) / len(sample)) < NUMERIC_GATE_THRESHOLD:
+            return None
+        
+        # Ambiguous values such as "1,200" keep the comma as a thousands separator
+        thousands_comma = sum(1 for value in matches if THOUSANDS_COMMA_PATTERN.match(value)
+                              and not DECIMAL_COMMA_PATTERN.match(value))
+        decimal_comma = sum(1 for value in matches if DECIMAL_COMMA_PATTERN.match(value)
+                            and not THOUSANDS_COMMA_PATTERN.match(value))
+        decimal = ',' if decimal_comma and not thousands_comma else '.'
+        
+        # Phone numbers and zero-padded codes look numeric but lose meaning as numbers
+        identifiers = sum(1 for value in matches if NUMERIC_IDENTIFIER_PATTERNS[decimal].match(value))
+        if identifiers > len(matches) * NUMERIC_IDENTIFIER_THRESHOLD:
+            return None
+        return decimal
+    
+    def _parse_numeric_strings(self, series: pd.Series, decimal: str = '.') -> pd.Series:
+        """Strip currency, percent and grouping characters in one pass and parse as numbers."""
+        cleaned = series.astype(str).str.translate(NUMERIC_TRANSLATIONS[decimal])
+        return pd.to_numeric(cleaned, errors='coerce')
+    
     def _handle_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Handle missing values intelligently based on column type."""
-        for col in df.columns:
-            if df[col].isnull().sum() > 0:
-                if df[col].dtype in ['int64', 'float64']:
-                    # Fill numeric columns with median
-                    df[col] = df[col].fillna(df[col].median())
-                elif df[col].dtype == 'object':
-                    # Fill categorical columns with mode
-                    mode_value = df[col].mode()
-                    if len(mode_value) > 0:
-                        df[col] = df[col].fillna(mode_value[0])
+        """
+        Fill missing values in place with the configured strategy for each column kind.
+        
+        Missing counts come from one isna() pass, numeric fill values from one
+        frame-level reduction, and all columns are filled by a single dict fillna.
+        """
+        missing = df.isna().sum()
+        incomplete = missing.index[missing.to_numpy() > 0]
+        numeric_columns, categorical_columns = [], []
+        for col in incomplete:
+            dtype = df[col].dtype
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                numeric_columns.append(col)
+            elif self._is_text_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype) \
+                    or pd.api.types.is_datetime64_any_dtype(dtype):
+                categorical_columns.append(col)
         
+        fill_values = {}
+        numeric_strategy = self.impute_strategies['numeric']
+        if numeric_columns and numeric_strategy != 'none':
+            if numeric_strategy == 'zero':
+                fill_values.update(dict.fromkeys(numeric_columns, 0))
+            else:
+                fill_values.update(self._column_centers(df, numeric_columns, numeric_strategy))
+        
+        categorical_strategy = self.impute_strategies['categorical']
+        if categorical_columns and categorical_strategy != 'none':
+            if categorical_strategy == 'mode':
+                fill_values.update(self._column_modes(df, categorical_columns))
+            else:
+                # Parsed dates keep their dtype rather than taking a text placeholder
+                fill_values.update({
+                    col: settings.IMPUTE_FILL_VALUE for col in categorical_columns
+                    if not pd.api.types.is_datetime64_any_dtype(df[col].dtype)
+                })
+            for col in categorical_columns:
+                categories = getattr(df[col], 'cat', None)
+                if col in fill_values and categories is not None and fill_values[col] not in categories.categories:
+                    df[col] = categories.add_categories([fill_values[col]])
+        
+        if fill_values:
+            df.fillna(fill_values, inplace=True)
         return df
     
+    @staticmethod
+    def _column_centers(df: pd.DataFrame, columns: List[str], strategy: str) -> Dict[str, Any]:
+        """
+        Median or mean of each numeric column, skipping missing values. NumPy float
+        columns are reduced together as one 2-D array; medians come from a single
+        column-wise sort, where NaN sorts last and each column's count picks its middle.
+        """
+        dtypes = df.dtypes
+        float_columns = [col for col in columns if isinstance(dtypes[col], np.dtype) and dtypes[col].kind == 'f']
+        centers = {}
+        if float_columns:
+            frame = df if len(float_columns) == len(df.columns) else df[float_columns]
+            values = frame.to_numpy(dtype=np.float64, copy=True)
+            del frame
+            missing = np.isnan(values)
+            counts = len(values) - missing.sum(axis=0)
+            if strategy == 'median':
+                values.sort(axis=0)
+                positions = np.arange(len(float_columns))
+                result = (values[np.maximum(counts - 1, 0) // 2, positions] + values[counts // 2, positions]) / 2
+            else:
+                values[missing] = 0
+                result = values.sum(axis=0) / np.maximum(counts, 1)
+            del values, missing
+            centers.update({col: value for col, value, count in zip(float_columns, result, counts) if count})
+        reduced = set(float_columns)
+        for col in columns:
+            if col not in reduced:
+                value = df[col].median() if strategy == 'median' else df[col].mean()
+                if pd.notna(value):
+                    centers[col] = value
+        return centers
+    
+    @staticmethod
+    def _column_modes(df: pd.DataFrame, columns: List[str]) -> Dict[str, Any]:
+        """
+        Most frequent value of each column, the smallest one on ties like Series.mode().
+        Categorical columns are counted from their integer codes with one bincount.
+        """
+        modes = {}
+        for col in columns:
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes = values.cat.codes.to_numpy()
+                counts = np.bincount(codes[codes >= 0], minlength=len(values.cat.categories))
+                if counts.any():
+                    modes[col] = values.cat.categories[counts.argmax()]
+                continue
+            counts = values.value_counts(sort=False)
+            if counts.empty:
+                continue
+            tied = counts.index[counts.to_numpy() == counts.max()]
+            try:
+                modes[col] = min(tied)
+            except TypeError:
+                modes[col] = tied[0]
+        return modes
+    
     def _analyze_columns(self, df: pd.DataFrame) -> Dict[str, Dict]:
         """
         Analyze each column for type, statistics, and business context.
+        
+        Frames with at least settings.COLUMN_ANALYSIS_MIN_COLUMNS columns are
+        profiled on a pool of analysis_workers threads or processes. Each column
+        is analyzed independently by the same code, so the result is identical to
+        the sequential one.
+        
+        Frames of at least settings.APPROXIMATE_MIN_ROWS rows (or any frame when
+        `approximate` is set) are profiled with mergeable sketches instead of exact
+        sorts and value counts; see _analyze_column_approximate. Long enough frames
+        are split into row partitions profiled in parallel; see _analyze_row_partitions.
+        
+        With `sampling` on, frames longer than sample_size are profiled from a
+        reservoir sample instead (unless `approximate` is set explicitly); see
+        _analyze_column_sampled.
         """
-        column_analysis = {}
+        sample = self._profile_sample(df) if self.approximate is not True else None
+        if sample is not None:
+            approximate = False
+            analyze = lambda column: self._analyze_column_sampled(column, sample[column.name])
+        else:
+            approximate = self.approximate if self.approximate is not None else len(df) >= settings.APPROXIMATE_MIN_ROWS
+            analyze = self._analyze_column_approximate if approximate else self._analyze_column
+        self.processing_stats['approximate'] = approximate
         
-        for col in df.columns:
-            col_data = df[col].dropna()
-            
-            # Determine column type
-            col_type = self._determine_column_type(col_data, col)
-            
-            # Calculate statistics
-            stats = self._calculate_column_statistics(col_data, col_type)
-            
-            # Detect business context
-            business_context = self._detect_business_context(col)
-            
-            # Calculate data quality score
-            quality_score = self._calculate_quality_score(col_data, df[col])
-            
-            column_analysis[col] = {
-                'type': col_type,
-                'cardinality': len(col_data.unique()),
-                'missing_count': df[col].isnull().sum(),
-                'missing_percentage': (df[col].isnull().sum() / len(df)) * 100,
-                'unique_values': len(col_data.unique()),
-                'statistics': stats,
-                'business_context': business_context,
-                'data_quality_score': quality_score,
-                'suggested_actions': self._suggest_column_actions(col_data, col_type, quality_score)
-            }
+        if approximate:
+            partitions = self._row_partitions(len(df), len(df.columns))
+            if len(partitions) > 1:
+                return self._analyze_row_partitions(df, partitions)
+        
+        columns = list(df.columns)
+        workers = min(self.analysis_workers, len(columns), os.cpu_count() or 1)
+        if workers <= 1 or len(columns) < settings.COLUMN_ANALYSIS_MIN_COLUMNS:
+            return {col: analyze(df[col]) for col in columns}
+        if self.analysis_executor == 'thread':
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return dict(zip(columns, executor.map(analyze, (df[col] for col in columns))))
+        return dict(zip(columns, self._analyze_columns_in_processes(df, workers, approximate, sample)))
+    
+    def _row_partitions(self, rows: int, columns: int) -> List[tuple]:
+        """
+        (start, stop) row ranges for map-reduce profiling: one per worker, bounded
+        by the cores available and by settings.ROW_PARTITION_MIN_CELLS values each,
+        so every partition outweighs the start-up of its worker process.
+        """
+        count = min(self.analysis_workers, os.cpu_count() or 1, rows * columns // settings.ROW_PARTITION_MIN_CELLS)
+        if count < 2:
+            return [(0, rows)]
+        bounds = np.linspace(0, rows, count + 1).astype(int).tolist()
+        return list(zip(bounds[:-1], bounds[1:]))
+    
+    def _analyze_row_partitions(self, df: pd.DataFrame, partitions: List[tuple]) -> Dict[str, Dict]:
+        """
+        Map-reduce sketch profile. Each row partition is folded into one
+        ColumnAccumulator per column on a process pool (map), and the partial
+        states are merged in partition order (reduce). Counts, moments, min/max and
+        the distinct and value counts of columns within the heavy-hitter capacity
+        equal the sequential profile's; quantiles stay within the KLL bound.
+        """
+        self.processing_stats['row_partitions'] = len(partitions)
+        accumulators = {col: self._column_accumulator(df[col]) for col in df.columns}
+        blocks = []
+        try:
+            # Large NumPy columns are shared once and sliced by each worker; the rest are pickled per partition
+            columns = [self._column_task(df[col], None, blocks) for col in df.columns]
+            tasks = [{
+                'start': start,
+                'stop': stop,
+                'accumulators': accumulators,
+                'columns': [{**spec, 'series': spec['series'].iloc[start:stop]} if 'series' in spec else spec
+                            for spec in columns]
+            } for start, stop in partitions]
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=len(partitions), mp_context=context) as executor:
+                partials = list(executor.map(_profile_partition_task, tasks))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+        
+        merged = partials[0]
+        for partial in partials[1:]:
+            self._merge_accumulators(merged, partial)
+        return {col: self._summarize_accumulator(accumulator) for col, accumulator in merged.items()}
+    
+    @staticmethod
+    def _merge_accumulators(accumulators: Dict[str, ColumnAccumulator], partial: Dict[str, ColumnAccumulator]) -> None:
+        """Reduce step: fold a partial per-column state into the running accumulators."""
+        for col, accumulator in partial.items():
+            accumulators[col].merge(accumulator)
+    
+    def _profile_sample(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Seeded reservoir sample of the frame's rows when sampled profiling applies,
+        otherwise None. The reservoir is fed chunk by chunk, as rows would arrive
+        from a parser, so a given seed always draws the same rows.
+        """
+        if not self.sampling or len(df) <= self.sample_size:
+            return None
+        reservoir = ReservoirSample(self.sample_size, self.sample_seed)
+        step = settings.STREAMING_CHUNK_ROWS
+        for start in range(0, len(df), step):
+            reservoir.update(min(step, len(df) - start))
+        self.processing_stats['sampling'] = {
+            'sample_size': self.sample_size,
+            'seed': self.sample_seed,
+            'exact_statistics': sorted(self.exact_statistics)
+        }
+        return df.take(reservoir.positions)
+    
+    def _analyze_columns_in_processes(self, df: pd.DataFrame, workers: int, approximate: bool = False,
+                                      sample: Optional[pd.DataFrame] = None) -> List[Dict]:
+        """
+        Analyze columns on a process pool. NumPy-backed columns (and category
+        codes) of at least settings.SHARED_MEMORY_MIN_BYTES are handed over in
+        shared memory; smaller and object columns are pickled.
+        """
+        date_formats = self.data_cache.get('date_formats', {})
+        blocks = []
+        try:
+            tasks = [self._column_task(df[col], date_formats.get(col), blocks) for col in df.columns]
+            options = {name: getattr(self, name) for name in ANALYSIS_OPTIONS}
+            for task in tasks:
+                task['approximate'] = approximate
+                task['options'] = options
+                if sample is not None:
+                    task['sample'] = sample[task['name']]
+            # Forking a threaded server can deadlock the children, so workers are spawned
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                return list(executor.map(_analyze_column_task, tasks))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+    
+    @staticmethod
+    def _column_task(series: pd.Series, date_format: Optional[str], blocks: list) -> Dict[str, Any]:
+        task = {'name': series.name, 'date_format': date_format}
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            values = series.cat.codes.to_numpy()
+            task['categories'] = dtype.categories
+            task['ordered'] = dtype.ordered
+        elif isinstance(dtype, np.dtype) and dtype != object:
+            values = series.to_numpy()
+        else:
+            values = None
+        if values is None or values.nbytes < settings.SHARED_MEMORY_MIN_BYTES:
+            task['series'] = series
+            return task
+        block, task['shared'] = SharedArray.create(values)
+        blocks.append(block)
+        return task
+    
+    def _analyze_column(self, column: pd.Series) -> Dict[str, Any]:
+        """Type, statistics, business context and quality of one column, all read from one ColumnProfile."""
+        profile = ColumnProfile.from_series(column)
+        
+        # Determine column type
+        col_type = self._determine_column_type(profile)
+        
+        # Calculate statistics
+        stats = self._calculate_column_statistics(profile, col_type)
+        
+        # Detect business context
+        business_context = self._detect_business_context(profile.name)
+        
+        # Calculate data quality score
+        quality_score = self._calculate_quality_score(profile)
+        
+        return {
+            'type': col_type,
+            'cardinality': profile.distinct_count,
+            'missing_count': profile.null_count,
+            'missing_percentage': (profile.null_count / profile.total) * 100 if profile.total else 0.0,
+            'unique_values': profile.distinct_count,
+            'statistics': stats,
+            'business_context': business_context,
+            'data_quality_score': quality_score,
+            'suggested_actions': self._suggest_column_actions(profile, col_type, quality_score)
+        }
+    
+    def _analyze_column_sampled(self, column: pd.Series, sample: pd.Series) -> Dict[str, Any]:
+        """
+        Profile of one column whose type, date sniffing, quality score and suggested
+        actions come from a row sample. Statistics named in exact_statistics are
+        computed on the whole column; the rest are read from the sample with its
+        counts scaled up to the column length.
+        """
+        profile = ColumnProfile.from_series(sample)
+        col_type = self._determine_column_type(profile)
+        
+        if 'cardinality' in self.exact_statistics or TYPE_STATISTICS.get(col_type) in self.exact_statistics:
+            stats_profile = ColumnProfile.from_series(column)
+            profile.extrapolate(stats_profile.total, stats_profile.null_count)
+        else:
+            null_count = int(column.isna().sum()) if 'missing' in self.exact_statistics else None
+            profile.extrapolate(len(column), null_count)
+            stats_profile = profile
+        
+        stats = self._calculate_column_statistics(stats_profile, col_type)
+        quality_score = self._calculate_quality_score(profile)
         
-        return column_analysis
+        return {
+            'type': col_type,
+            'cardinality': stats_profile.distinct_count,
+            'missing_count': stats_profile.null_count,
+            'missing_percentage': (stats_profile.null_count / stats_profile.total) * 100 if stats_profile.total else 0.0,
+            'unique_values': stats_profile.distinct_count,
+            'statistics': stats,
+            'business_context': self._detect_business_context(profile.name),
+            'data_quality_score': quality_score,
+            'suggested_actions': self._suggest_column_actions(stats_profile, col_type, quality_score)
+        }
+    
+    def _analyze_column_approximate(self, column: pd.Series) -> Dict[str, Any]:
+        """
+        Sketch-based profile of one column in the streaming profiler's shape: a
+        HyperLogLog for cardinality, a KLL sketch for quantiles and a Misra-Gries
+        summary for top values, fed in STREAMING_CHUNK_ROWS slices so temporaries
+        stay bounded. The entry carries the sketches' error bounds.
+        """
+        accumulator = self._column_accumulator(column)
+        accumulator.update_in_chunks(column, settings.STREAMING_CHUNK_ROWS)
+        return self._summarize_accumulator(accumulator)
     
-    def _determine_column_type(self, col_data: pd.Series, col_name: str) -> str:
+    def _column_accumulator(self, column: pd.Series) -> ColumnAccumulator:
+        """Empty accumulator for a column, with its numeric and date handling decided from the data."""
+        date_format = None
+        is_dates = pd.api.types.is_datetime64_any_dtype(column)
+        numeric = pd.api.types.is_numeric_dtype(column) and not is_dates
+        if not numeric and not is_dates:
+            date_format = self.data_cache.get('date_formats', {}).get(column.name) or self._infer_date_format(column)
+        return ColumnAccumulator(column.name, numeric, is_dates or date_format is not None, date_format=date_format)
+    
+    def _determine_column_type(self, profile: ColumnProfile) -> str:
         """Determine the most appropriate column type."""
-        if col_data.empty:
+        if profile.count == 0:
             return 'unknown'
         
+        # Columns parsed during cleaning
+        if pd.api.types.is_datetime64_any_dtype(profile.values):
+            return 'date'
+        
         # Check if it's numeric
-        if pd.api.types.is_numeric_dtype(col_data):
+        if profile.numeric:
             return 'numeric'
         
-        # Check if it's boolean
-        if col_data.dtype == 'bool' or set(col_data.unique()).issubset({'True', 'False', True, False, 1, 0}):
+        # Check if it's boolean; more distinct values than the flag spellings rule it out
+        if pd.api.types.is_bool_dtype(profile.values) or (
+                profile.distinct_count <= len(BOOLEAN_VALUES)
+                and set(profile.value_counts.index).issubset(BOOLEAN_VALUES)):
             return 'boolean'
         
         # Check if it's date
-        if self._is_date_column(col_data):
+        if self._is_date_column(profile.values):
             return 'date'
         
         # Check if it's categorical (low cardinality)
-        unique_ratio = len(col_data.unique()) / len(col_data)
+        unique_ratio = profile.distinct_count / profile.count
         if unique_ratio < 0.1:  # Less than 10% unique values
             return 'categorical'
         
         return 'text'
     
     def _is_date_column(self, col_data: pd.Series) -> bool:
-        """Check if column contains date data."""
-        sample_data = col_data.head(100)  # Check first 100 values
-        
-        for value in sample_data:
-            if pd.isna(value):
+        """Check if column contains date data, caching the format inferred from a sample."""
+        if pd.api.types.is_datetime64_any_dtype(col_data):
+            return True
+        date_format = self._infer_date_format(col_data)
+        if date_format is None:
+            return False
+        self.data_cache.setdefault('date_formats', {})[col_data.name] = date_format
+        return True
+    
+    def _infer_date_format(self, values: pd.Series) -> Optional[str]:
+        """
+        Pick the DATE_FORMATS entry (or the ISO 8601 fallback) that parses the most
+        of a sample of the column. Returns None unless it parses at least
+        DATE_MATCH_THRESHOLD of the sample; earlier formats win ties, so
+        month-first is preferred for ambiguous dates.
+        """
+        sample = values.dropna().head(DATE_SAMPLE_SIZE)
+        if sample.empty:
+            return None
+        sample = sample.astype(str).str.strip()
+        best_format, best_matches = None, 0
+        for date_format in [*DATE_FORMATS, DATE_FALLBACK_FORMAT]:
+            matches = int(self._parse_dates(sample, date_format).notna().sum())
+            if matches > best_matches:
+                best_format, best_matches = date_format, matches
+                if matches == len(sample):
+                    break
+        return best_format if best_matches >= len(sample) * DATE_MATCH_THRESHOLD else None
+    
+    @staticmethod
+    def _parse_dates(values: pd.Series, date_format: Optional[str]) -> pd.Series:
+        """Vectorized parse with one explicit format; unparseable values become NaT."""
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+        if not pd.api.types.is_string_dtype(values.dtype) or isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(str)
+        try:
+            return pd.to_datetime(values, format=date_format, errors='coerce')
+        except (ValueError, TypeError, OverflowError):
+            # e.g. mixed UTC offsets, which have no single datetime64 dtype
+            return pd.Series(pd.NaT, index=values.index, name=values.name, dtype='datetime64[ns]')
+    
+    def _parse_date_columns(self, df: pd.DataFrame) -> Dict[str, str]:
+        """
+        Convert text columns holding dates to datetime64 in place. A column is
+        converted only when its inferred format parses at least
+        DATE_MATCH_THRESHOLD of its values. Returns {column: format}.
+        """
+        date_formats = {}
+        for col in df.columns:
+            values = df[col]
+            if not self._is_text_dtype(values.dtype) or isinstance(values.dtype, pd.CategoricalDtype):
                 continue
-            try:
-                parser.parse(str(value))
-                return True
-            except:
+            date_format = self._infer_date_format(values)
+            if date_format is None:
                 continue
-        
-        return False
+            parsed = self._parse_dates(values, date_format)
+            if parsed.count() >= values.count() * DATE_MATCH_THRESHOLD:
+                df[col] = parsed
+                date_formats[col] = date_format
+        return date_formats
     
-    def _calculate_column_statistics(self, col_data: pd.Series, col_type: str) -> Dict:
+    def _calculate_column_statistics(self, profile: ColumnProfile, col_type: str) -> Dict:
         """Calculate type-specific statistics for a column."""
         stats = {}
         
         if col_type == 'numeric':
             stats = {
-                'mean': float(col_data.mean()) if len(col_data) > 0 else None,
-                'median': float(col_data.median()) if len(col_data) > 0 else None,
-                'std': float(col_data.std()) if len(col_data) > 0 else None,
-                'min': float(col_data.min()) if len(col_data) > 0 else None,
-                'max': float(col_data.max()) if len(col_data) > 0 else None,
-                'q25': float(col_data.quantile(0.25)) if len(col_data) > 0 else None,
-                'q75': float(col_data.quantile(0.75)) if len(col_data) > 0 else None
+                'mean': profile.mean,
+                'median': profile.median,
+                'std': profile.std,
+                'min': profile.min,
+                'max': profile.max,
+                'q25': profile.q25,
+                'q75': profile.q75
             }
         elif col_type == 'categorical':
-            value_counts = col_data.value_counts()
+            # Top settings.TOP_VALUES_LIMIT values plus the remainder, unless the full distribution was requested
+            limit = len(profile.value_counts) if self.full_value_counts else settings.TOP_VALUES_LIMIT
+            value_counts = top_counts(profile.value_counts, limit)
             stats = {
                 'top_values': value_counts.head(5).to_dict(),
-                'value_counts': value_counts.to_dict()
+                'value_counts': value_counts.to_dict(),
+                'other_count': profile.count - int(value_counts.sum()),
+                'distinct_count': profile.distinct_count
             }
         elif col_type == 'date':
-            try:
-                date_data = pd.to_datetime(col_data)
+            # Typed during cleaning, otherwise parsed with the format cached by _is_date_column
+            date_format = self.data_cache.get('date_formats', {}).get(profile.name)
+            date_data = self._parse_dates(profile.values, date_format).dropna()
+            if len(date_data) > 0:
                 stats = {
-                    'min_date': str(date_data.min()) if len(date_data) > 0 else None,
-                    'max_date': str(date_data.max()) if len(date_data) > 0 else None,
+                    'min_date': str(date_data.min()),
+                    'max_date': str(date_data.max()),
                     'date_range_days': (date_data.max() - date_data.min()).days if len(date_data) > 1 else None
                 }
-            except:
+            else:
                 stats = {'error': 'Could not parse dates'}
         
         return stats
@@ -421,41 +1421,40 @@ class CSVProcessor:
         
         return 'unknown'
     
-    def _calculate_quality_score(self, col_data: pd.Series, original_col: pd.Series) -> float:
+    def _calculate_quality_score(self, profile: ColumnProfile) -> float:
         """Calculate data quality score (0-1) for a column."""
-        if len(original_col) == 0:
+        if profile.total == 0:
             return 0.0
         
         # Completeness score
-        completeness = len(col_data) / len(original_col)
+        completeness = profile.count / profile.total
         
-        # Consistency score (for numeric columns)
+        # Consistency score (for numeric columns): share of values within 3 standard deviations
         consistency = 1.0
-        if pd.api.types.is_numeric_dtype(col_data):
-            if len(col_data) > 0:
-                # Check for outliers (values beyond 3 standard deviations)
-                mean_val = col_data.mean()
-                std_val = col_data.std()
-                if std_val > 0:
-                    outliers = ((col_data < mean_val - 3*std_val) | (col_data > mean_val + 3*std_val)).sum()
-                    consistency = 1 - (outliers / len(col_data))
+        if profile.numeric and profile.count > 0:
+            consistency = 1 - (profile.outlier_count / profile.count)
         
         # Overall quality score
         quality_score = (completeness + consistency) / 2
         return round(quality_score, 3)
     
-    def _suggest_column_actions(self, col_data: pd.Series, col_type: str, quality_score: float) -> List[str]:
+    def _suggest_column_actions(self, profile: ColumnProfile, col_type: str, quality_score: float) -> List[str]:
         """Suggest actions for improving column data quality."""
+        std = profile.std if col_type == 'numeric' else None
+        cardinality = profile.distinct_count if col_type == 'categorical' else 0
+        return self._suggest_actions_from_stats(col_type, quality_score, std, cardinality)
+    
+    def _suggest_actions_from_stats(self, col_type: str, quality_score: float,
+                                    std: Optional[float], cardinality: int) -> List[str]:
         actions = []
         
         if quality_score < 0.7:
             actions.append("Review data quality issues")
         
-        if col_type == 'numeric' and len(col_data) > 0:
-            if col_data.std() == 0:
-                actions.append("Column has no variance - consider removing")
+        if col_type == 'numeric' and std == 0:
+            actions.append("Column has no variance - consider removing")
         
-        if col_type == 'categorical' and len(col_data.unique()) > 50:
+        if col_type == 'categorical' and cardinality > 50:
             actions.append("High cardinality categorical - consider grouping")
         
         return actions
@@ -478,29 +1477,42 @@ class CSVProcessor:
         
         return business_metrics
     
-    def _suggest_visualizations(self, column_info: Dict, business_metrics: List) -> List[Dict]:
+    def _suggest_visualizations(self, column_info: Dict, business_metrics: List,
+                                df: Optional[pd.DataFrame] = None) -> List[Dict]:
         """
         Generate AI-powered visualization suggestions.
+        
+        Line charts (date x numeric) and scatter plots (numeric x numeric) are
+        capped at settings.VISUALIZATION_PAIR_LIMIT each. When the data is at
+        hand, pairs are ranked by absolute correlation (numeric against the date
+        for trends) from one correlation matrix; otherwise they keep column order.
         """
         suggestions = []
+        limit = settings.VISUALIZATION_PAIR_LIMIT
         
         # Get column types
         numeric_cols = [col for col, info in column_info.items() if info['type'] == 'numeric']
         categorical_cols = [col for col, info in column_info.items() if info['type'] == 'categorical']
         date_cols = [col for col, info in column_info.items() if info['type'] == 'date']
         
-        # Time series charts
+        correlations = None
+        if df is not None and numeric_cols and len(numeric_cols) + len(date_cols) >= 2:
+            correlations = self._correlation_matrix(df, date_cols + numeric_cols)
+        
+        # Time series charts, strongest trends first
         if date_cols and numeric_cols:
-            for date_col in date_cols:
-                for num_col in numeric_cols:
-                    suggestions.append({
-                        'type': 'line_chart',
-                        'title': f'{num_col} over time',
-                        'x_axis': date_col,
-                        'y_axis': num_col,
-                        'priority': 'high',
-                        'description': f'Time series showing {num_col} trends'
-                    })
+            rows = np.repeat(np.arange(len(date_cols)), len(numeric_cols))
+            cols = len(date_cols) + np.tile(np.arange(len(numeric_cols)), len(date_cols))
+            for i, j in self._rank_pairs(rows, cols, correlations, limit):
+                date_col, num_col = date_cols[i], numeric_cols[j - len(date_cols)]
+                suggestions.append({
+                    'type': 'line_chart',
+                    'title': f'{num_col} over time',
+                    'x_axis': date_col,
+                    'y_axis': num_col,
+                    'priority': 'high',
+                    'description': f'Time series showing {num_col} trends'
+                })
         
         # Distribution charts
         for num_col in numeric_cols:
@@ -522,27 +1534,84 @@ class CSVProcessor:
                 'description': f'Breakdown by {cat_col}'
             })
         
-        # Scatter plots for numeric pairs
+        # Scatter plots for the most correlated numeric pairs
         if len(numeric_cols) >= 2:
-            for i, col1 in enumerate(numeric_cols):
-                for col2 in numeric_cols[i+1:]:
-                    suggestions.append({
-                        'type': 'scatter_plot',
-                        'title': f'{col1} vs {col2}',
-                        'x_axis': col1,
-                        'y_axis': col2,
-                        'priority': 'low',
-                        'description': f'Correlation between {col1} and {col2}'
-                    })
+            offset = len(date_cols)
+            rows, cols = np.triu_indices(len(numeric_cols), 1)
+            for i, j in self._rank_pairs(rows + offset, cols + offset, correlations, limit):
+                col1, col2 = numeric_cols[i - offset], numeric_cols[j - offset]
+                suggestion = {
+                    'type': 'scatter_plot',
+                    'title': f'{col1} vs {col2}',
+                    'x_axis': col1,
+                    'y_axis': col2,
+                    'priority': 'low',
+                    'description': f'Correlation between {col1} and {col2}'
+                }
+                if correlations is not None and not np.isnan(correlations[i, j]):
+                    suggestion['correlation'] = round(float(correlations[i, j]), 3)
+                suggestions.append(suggestion)
         
         return suggestions
     
+    def _correlation_matrix(self, df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+        """
+        Pearson correlations between columns (dates as timestamps), from at most
+        CORRELATION_SAMPLE_ROWS reservoir-sampled rows. NaN where undefined.
+        """
+        if len(df) > CORRELATION_SAMPLE_ROWS:
+            reservoir = ReservoirSample(CORRELATION_SAMPLE_ROWS, settings.PROFILE_SAMPLE_SEED)
+            reservoir.update(len(df))
+            df = df.take(reservoir.positions)
+        
+        values = np.empty((len(df), len(columns)), dtype=np.float64)
+        for position, col in enumerate(columns):
+            series = df[col]
+            if not pd.api.types.is_numeric_dtype(series):
+                # Dates (datetime64 or Arrow date/timestamp) as ns timestamps in UTC, NaT as NaN
+                series = pd.to_datetime(series, errors='coerce', utc=True).dt.tz_localize(None)
+                stamps = series.to_numpy(dtype='datetime64[ns]').view(np.int64).astype(np.float64)
+                stamps[series.isna().to_numpy()] = np.nan
+                values[:, position] = stamps
+            else:
+                values[:, position] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        # Pairwise-complete Pearson correlation as matrix products over the valid-value mask,
+        # with columns centered first for numerical stability
+        valid = ~np.isnan(values)
+        counts = valid.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values -= np.where(counts > 0, np.nansum(values, axis=0) / counts, 0.0)
+            values[~valid] = 0.0
+            mask = valid.astype(np.float64)
+            n = mask.T @ mask
+            sums = values.T @ mask  # [i, j]: sum of column i over rows where j is valid too
+            squares = (values * values).T @ mask
+            cross = values.T @ values
+            covariance = cross - sums * sums.T / n
+            variance = squares - sums * sums / n
+            return covariance / np.sqrt(variance * variance.T)
+    
+    @staticmethod
+    def _rank_pairs(rows: np.ndarray, cols: np.ndarray, correlations: Optional[np.ndarray],
+                    limit: int) -> List[tuple]:
+        """The `limit` (row, col) matrix positions with the largest absolute correlation, strongest first."""
+        if correlations is not None:
+            strength = np.nan_to_num(np.abs(correlations[rows, cols]), nan=-1.0)
+            order = np.argsort(-strength, kind='stable')[:limit]
+            rows, cols = rows[order], cols[order]
+        return list(zip(rows[:limit].tolist(), cols[:limit].tolist()))
+    
     def _assess_data_quality(self, df: pd.DataFrame, column_info: Dict) -> Dict[str, Any]:
         """
         Comprehensive data quality assessment.
         """
         total_cells = len(df) * len(df.columns)
         missing_cells = df.isnull().sum().sum()
+        # Reuse the hashes from cleaning when they still describe this frame
+        row_hashes = self.data_cache.get('row_hashes')
+        if row_hashes is None or len(row_hashes) != len(df):
+            row_hashes = self._row_hashes(df)
         completeness = 1 - (missing_cells / total_cells) if total_cells > 0 else 0
         
         # Calculate average quality score
@@ -555,10 +1624,309 @@ class CSVProcessor:
             'total_rows': len(df),
             'total_columns': len(df.columns),
             'missing_cells': missing_cells,
-            'duplicate_rows': len(df) - len(df.drop_duplicates()),
+            'duplicate_rows': len(df) - len(pd.unique(row_hashes)),
             'quality_by_column': {col: info['data_quality_score'] for col, info in column_info.items()}
         }
     
+    # Streaming mode
+    @staticmethod
+    def _mark_seen_hashes(hashes: np.ndarray, seen_hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Flag row hashes repeated within the chunk or present in the sorted seen_hashes,
+        and return them with seen_hashes extended by the new ones, still sorted.
+
+        Lookups are binary searches and the new hashes (sorted on their own) are merged
+        in with one linear insert, so each chunk costs O(chunk log chunk + seen) rather
+        than re-sorting everything seen so far.
+        """
+        duplicate = pd.Series(hashes).duplicated().to_numpy()
+        if len(seen_hashes):
+            positions = np.searchsorted(seen_hashes, hashes)
+            duplicate |= seen_hashes[np.minimum(positions, len(seen_hashes) - 1)] == hashes
+        new = np.sort(hashes[~duplicate])
+        return duplicate, np.insert(seen_hashes, np.searchsorted(seen_hashes, new), new)
+    
+    def _process_upload_streaming(self, file_content: memoryview, filename: str, start_time: float) -> Dict[str, Any]:
+        """
+        Profile the upload chunk by chunk with online column accumulators.
+        
+        Memory is bounded by the chunk size and fixed-size sketches, plus 8 bytes per
+        distinct row for cross-chunk duplicate detection. Statistics describe the
+        observed values: missing values are counted but not imputed, and medians and
+        quartiles come from a quantile sketch.
+        
+        With more than one analysis worker and core, chunks after the first are
+        profiled on a process pool as independent row partitions and their partial
+        accumulators merged in chunk order; parsing, cleaning and deduplication stay
+        in this process.
+        
+        Plain CSV uploads leave a ProfileCheckpoint of this state. An upload that
+        extends a checkpointed one (same leading bytes, same sniffed dialect and
+        header) only has its new rows parsed; their chunks are folded into the
+        checkpointed accumulators, row hashes and counters, exactly as if the
+        stream had continued.
+        """
+        checkpointable = split_extension(filename) == ('csv', None)
+        append = self._find_append_checkpoint(file_content) if checkpointable else None
+        if append:
+            checkpoint, offset = append
+            accumulators: Dict[str, ColumnAccumulator] = checkpoint['accumulators']
+            numeric_columns: Dict[str, str] = checkpoint['numeric_columns']
+            seen_hashes = checkpoint['seen_hashes']
+            total_rows, empty_rows = checkpoint['total_rows'], checkpoint['empty_rows']
+            duplicate_rows, chunks_processed = checkpoint['duplicate_rows'], checkpoint['chunks_processed']
+            data_preview, raw_columns, dialect = checkpoint['data_preview'], checkpoint['raw_columns'], checkpoint['dialect']
+            chunks = self._iter_tail_chunks(file_content, offset, checkpoint, settings.STREAMING_CHUNK_ROWS)
+        else:
+            accumulators = {}
+            numeric_columns = {}
+            seen_hashes = np.empty(0, dtype=np.uint64)
+            total_rows = empty_rows = duplicate_rows = chunks_processed = 0
+            data_preview, raw_columns, dialect = [], None, None
+            chunks = self._iter_chunks(file_content, filename, settings.STREAMING_CHUNK_ROWS)
+        previous_rows = total_rows
+        
+        # Chunks after the first are folded into fresh accumulators on a process pool
+        # (map) and merged back in chunk order (reduce), while this process parses on
+        workers = min(self.analysis_workers, os.cpu_count() or 1)
+        pool, pending, pooled_chunks = None, deque(), 0
+        try:
+            for chunk in chunks:
+                chunks_processed += 1
+                rows_read = len(chunk)
+                if raw_columns is None:
+                    raw_columns = list(chunk.columns)
+                chunk = self._clean_chunk(chunk, numeric_columns, is_first=not accumulators)
+                empty_rows += rows_read - len(chunk)
+            
+                # Drop rows already seen in this or an earlier chunk
+                hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+                duplicate, seen_hashes = self._mark_seen_hashes(hashes, seen_hashes)
+                duplicate_rows += int(duplicate.sum())
+                chunk = chunk[~duplicate]
+            
+                first = not accumulators
+                if first:
+                    for col in chunk.columns:
+                        numeric = pd.api.types.is_numeric_dtype(chunk[col])
+                        date_format = None if numeric else self._infer_date_format(chunk[col])
+                        accumulators[col] = ColumnAccumulator(col, numeric, date_format is not None,
+                                                              date_format=date_format)
+                    data_preview = chunk.head(10).to_dict('records')
+            
+                if workers > 1 and not first:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+                    pending.append(pool.submit(_profile_partition_task, {
+                        'accumulators': {col: accumulator.empty_like() for col, accumulator in accumulators.items()},
+                        'columns': [{'name': col, 'series': chunk[col]} for col in accumulators]
+                    }))
+                    pooled_chunks += 1
+                    # A bounded number of chunks in flight keeps memory flat
+                    if len(pending) > 2 * workers:
+                        self._merge_accumulators(accumulators, pending.popleft().result())
+                else:
+                    for col, accumulator in accumulators.items():
+                        accumulator.update(chunk[col])
+                total_rows += len(chunk)
+            
+            while pending:
+                self._merge_accumulators(accumulators, pending.popleft().result())
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        if checkpointable and raw_columns is not None:
+            if dialect is None:
+                dialect = {'encoding': self.processing_stats['encoding'], **self.processing_stats['dialect']}
+            ProfileCheckpoint.save(file_content, {
+                'accumulators': accumulators, 'numeric_columns': numeric_columns, 'seen_hashes': seen_hashes,
+                'total_rows': total_rows, 'empty_rows': empty_rows, 'duplicate_rows': duplicate_rows,
+                'chunks_processed': chunks_processed, 'data_preview': data_preview,
+                'raw_columns': raw_columns, 'dialect': dialect
+            })
+        
+        # Columns with no values at all are dropped, as in the in-memory path; the
+        # checkpoint keeps them in case appended rows fill them
+        empty_columns = [col for col, acc in accumulators.items() if acc.count == 0]
+        accumulators = {col: acc for col, acc in accumulators.items() if acc.count > 0}
+        
+        cleaning_applied = []
+        if empty_rows or empty_columns:
+            cleaning_applied.append("removed_empty_rows_columns")
+        cleaning_applied.append("cleaned_column_names")
+        if duplicate_rows:
+            cleaning_applied.append("removed_duplicate_rows")
+        self.processing_stats['cleaning_applied'] = cleaning_applied
+        
+        column_analysis = {col: self._summarize_accumulator(acc) for col, acc in accumulators.items()}
+        business_metrics = self._detect_business_metrics(column_analysis)
+        visualization_suggestions = self._suggest_visualizations(column_analysis, business_metrics)
+        
+        missing_cells = sum(acc.null_count for acc in accumulators.values())
+        total_cells = total_rows * len(accumulators)
+        quality_scores = [info['data_quality_score'] for info in column_analysis.values()]
+        data_quality = {
+            'overall_score': round(sum(quality_scores) / len(quality_scores), 3) if quality_scores else 0,
+            'completeness': round(1 - (missing_cells / total_cells), 3) if total_cells > 0 else 0,
+            'total_rows': total_rows,
+            'total_columns': len(accumulators),
+            'missing_cells': missing_cells,
+            'duplicate_rows': duplicate_rows,
+            'quality_by_column': {col: info['data_quality_score'] for col, info in column_analysis.items()}
+        }
+        
+        result = {
+            'success': True,
+            'data_preview': data_preview,
+            'metadata': {
+                'encoding': self.processing_stats.get('encoding', 'unknown'),
+                'separator': self.processing_stats.get('separator', 'unknown'),
+                'dialect': self.processing_stats.get('dialect', {}),
+                'sniff_time': self.processing_stats.get('sniff_time', 0.0),
+                'rows_processed': total_rows,
+                'columns_processed': len(accumulators),
+                'cleaning_applied': cleaning_applied,
+                'processing_time': time.time() - start_time,
+                'streaming': True,
+                'approximate': True,
+                'chunks_processed': chunks_processed,
+                'date_formats': {col: acc.date_format for col, acc in accumulators.items() if acc.date_format}
+            },
+            'column_analysis': column_analysis,
+            'data_quality': data_quality,
+            'visualization_suggestions': visualization_suggestions,
+            'business_insights': business_metrics,
+            'errors': [],
+            'warnings': []
+        }
+        if pooled_chunks:
+            result['metadata']['row_partitions'] = pooled_chunks + (0 if append else 1)
+        if append:
+            result['metadata']['incremental'] = {
+                'previous_rows': previous_rows,
+                'appended_rows': total_rows - previous_rows,
+                'resumed_at_byte': offset
+            }
+        return convert_numpy_types(result)
+    
+    def _find_append_checkpoint(self, file_content: memoryview):
+        """
+        (checkpoint, offset of the first new row) when the upload extends a
+        checkpointed one: its prefix hashes to the checkpointed content and its
+        schema, i.e. the dialect and header sniffed from the shared leading
+        bytes, is unchanged. None otherwise.
+        """
+        append = ProfileCheckpoint.find_append(file_content)
+        if append is None:
+            return None
+        checkpoint = append[0]
+        dialect = self._sniff_csv_dialect(file_content)
+        if any(dialect.get(key) != value for key, value in checkpoint['dialect'].items()):
+            return None
+        return append
+    
+    def _iter_tail_chunks(self, file_content: memoryview, offset: int, checkpoint: Dict[str, Any], chunk_rows: int):
+        """Yield the rows after `offset` in chunks, under the checkpointed header the tail lacks."""
+        dialect = checkpoint['dialect']
+        self._record_dialect(dialect)
+        tail_dialect = {**dialect, 'encoding': 'utf-8' if dialect['encoding'] == 'utf-8-sig' else dialect['encoding'],
+                        'header_row': 0, 'has_header': False}
+        reader = self._parse_csv(file_content[offset:], tail_dialect, chunksize=chunk_rows,
+                                 encoding_errors='replace', names=checkpoint['raw_columns'])
+        with reader:
+            yield from reader
+    
+    def _iter_chunks(self, file_content: memoryview, filename: str, chunk_rows: int):
+        """Yield the upload as DataFrames of at most chunk_rows rows."""
+        file_content, file_extension = self._resolve_source(file_content, filename)
+        
+        if file_extension == 'csv':
+            dialect = self._sniff_csv_dialect(file_content)
+            self._record_dialect(dialect)
+            # Bytes past the sniffed sample cannot trigger a re-parse mid-stream
+            reader = self._parse_csv(file_content, dialect, chunksize=chunk_rows, encoding_errors='replace')
+            with reader:
+                yield from reader
+        elif file_extension in ['xlsx', 'xls']:
+            # Stream the first sheet with data row by row; other sheets are only probed
+            sheets = ExcelReader.survey_sheets(file_content, file_extension)
+            if not sheets:
+                raise ValueError("Could not read Excel file: workbook has no sheets")
+            sheet_name = next((sheet['name'] for sheet in sheets if sheet['rows'] != 0), sheets[0]['name'])
+            self._record_excel_stats(file_extension, sheet_name, sheets)
+            yield from ExcelReader.iter_batches(file_content, sheet_name, batch_rows=chunk_rows,
+                                                extension=file_extension)
+        elif file_extension in ['json', 'jsonl', 'ndjson']:
+            self._record_json_stats(file_content, file_extension)
+            columns = None
+            for batch in JSONReader.iter_batches(file_content, batch_rows=chunk_rows, extension=file_extension):
+                # The first batch fixes the schema; keys first seen later are not profiled
+                if columns is None:
+                    columns = batch.columns
+                yield batch.reindex(columns=columns)
+        else:
+            raise ValueError(f"Unsupported file type: {file_extension}")
+    
+    def _clean_chunk(self, chunk: pd.DataFrame, numeric_columns: Dict[str, str], is_first: bool) -> pd.DataFrame:
+        """
+        Per-chunk version of _clean_and_normalize. Numeric coercion and each column's
+        decimal separator are decided on the first chunk and then applied
+        unconditionally so every chunk agrees on dtypes.
+        """
+        chunk = chunk.dropna(how='all')
+        chunk.columns = [self._clean_column_name(col) for col in chunk.columns]
+        
+        if is_first:
+            for col in chunk.columns:
+                if self._is_text_dtype(chunk[col].dtype):
+                    decimal = self._infer_numeric_format(chunk[col])
+                    if decimal is None:
+                        continue
+                    converted = self._parse_numeric_strings(chunk[col], decimal)
+                    if converted.notna().sum() > len(chunk) * 0.5:
+                        numeric_columns[col] = decimal
+                        chunk[col] = converted
+        else:
+            for col, decimal in numeric_columns.items():
+                if self._is_text_dtype(chunk[col].dtype):
+                    chunk[col] = self._parse_numeric_strings(chunk[col], decimal)
+        
+        return chunk
+    
+    def _summarize_accumulator(self, accumulator: ColumnAccumulator) -> Dict[str, Any]:
+        """Build a column_analysis entry, with its error bounds, from sketch-based statistics."""
+        col_type = self._determine_accumulator_type(accumulator)
+        completeness = accumulator.count / accumulator.total if accumulator.total else 0.0
+        quality_score = round((completeness + 1 - accumulator.outlier_fraction()) / 2, 3)
+        cardinality = accumulator.distinct_count
+        
+        return {
+            'type': col_type,
+            'cardinality': cardinality,
+            'missing_count': accumulator.null_count,
+            'missing_percentage': (accumulator.null_count / accumulator.total) * 100 if accumulator.total else 0.0,
+            'unique_values': cardinality,
+            'statistics': accumulator.statistics(col_type, None if self.full_value_counts else settings.TOP_VALUES_LIMIT),
+            'business_context': self._detect_business_context(accumulator.name),
+            'data_quality_score': quality_score,
+            'suggested_actions': self._suggest_actions_from_stats(col_type, quality_score, accumulator.std, cardinality),
+            'error_bounds': accumulator.error_bounds()
+        }
+    
+    def _determine_accumulator_type(self, accumulator: ColumnAccumulator) -> str:
+        """Streaming counterpart of _determine_column_type."""
+        if accumulator.count == 0:
+            return 'unknown'
+        if accumulator.numeric:
+            return 'numeric'
+        if accumulator.frequent.exact and set(accumulator.frequent.counters).issubset(BOOLEAN_VALUES):
+            return 'boolean'
+        if accumulator.track_dates:
+            return 'date'
+        if accumulator.distinct_count / accumulator.count < 0.1:
+            return 'categorical'
+        return 'text'
+    
     def _handle_processing_errors(self, error: Exception, context: str) -> Dict[str, Any]:
         """
         Graceful error handling with recovery suggestions.
@@ -637,3 +2005,52 @@ class CSVProcessor:
 
 # Maintain backward compatibility
 AnalyticsService = CSVProcessor 
+
+
+_worker_processor: Optional[CSVProcessor] = None
+
+
+def _analyze_column_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Process-pool entry point: rebuild one column (from shared memory when large) and analyze it."""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = CSVProcessor(analysis_workers=1)
+    processor = _worker_processor
+    processor.data_cache['date_formats'] = {task['name']: task['date_format']} if task['date_format'] else {}
+    for name, value in task['options'].items():
+        setattr(processor, name, value)
+    if 'sample' in task:
+        analyze = lambda column: processor._analyze_column_sampled(column, task['sample'])
+    else:
+        analyze = processor._analyze_column_approximate if task.get('approximate') else processor._analyze_column
+    if 'series' in task:
+        return analyze(task['series'])
+    
+    with SharedArray.attach(task['shared']) as values:
+        if 'categories' in task:
+            values = pd.Categorical.from_codes(values, categories=task['categories'], ordered=task['ordered'])
+        column = pd.Series(values, name=task['name'], copy=False)
+        result = analyze(column)
+        # Views of the block must be gone before it is closed
+        del column, values
+    return result
+
+
+def _profile_partition_task(task: Dict[str, Any]) -> Dict[str, ColumnAccumulator]:
+    """Process-pool entry point: fold one row partition of every column into the task's accumulators."""
+    accumulators = task['accumulators']
+    step = settings.STREAMING_CHUNK_ROWS
+    for spec in task['columns']:
+        accumulator = accumulators[spec['name']]
+        if 'series' in spec:
+            accumulator.update_in_chunks(spec['series'], step)
+            continue
+        with SharedArray.attach(spec['shared']) as values:
+            values = values[task['start']:task['stop']]
+            if 'categories' in spec:
+                values = pd.Categorical.from_codes(values, categories=spec['categories'], ordered=spec['ordered'])
+            column = pd.Series(values, name=spec['name'], copy=False)
+            accumulator.update_in_chunks(column, step)
+            # Views of the block must be gone before it is closed
+            del column, values
+    return accumulators
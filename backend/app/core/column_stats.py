@@ -0,0 +1,301 @@
+"""
+Per-column statistics: single-pass profiles of in-memory columns, and online,
+mergeable accumulators for chunked (streaming) profiling.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+from app.core.sketches import FrequentItems, HyperLogLog, KLLSketch
+
+
+class ColumnAccumulator:
+    """
+    Running statistics for one column, updated chunk by chunk.
+
+    Tracks counts, nulls, Welford mean/variance, min/max, a KLL quantile sketch,
+    a HyperLogLog distinct counter and a heavy-hitters summary of top values.
+    Memory is bounded by the sketch sizes, not by the number of rows seen.
+    """
+
+    def __init__(self, name: str, numeric: bool, track_dates: bool = False,
+                 sketch_k: int = 200, hll_precision: int = 12, top_capacity: int = 1000,
+                 date_format: Optional[str] = None):
+        self.name = name
+        self.numeric = numeric
+        self.track_dates = track_dates
+        self.date_format = date_format
+        self.count = 0
+        self.null_count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.min_date: Optional[pd.Timestamp] = None
+        self.max_date: Optional[pd.Timestamp] = None
+        self.quantiles = KLLSketch(sketch_k) if numeric else None
+        self.distinct = HyperLogLog(hll_precision)
+        self.frequent = FrequentItems(top_capacity)
+
+    @property
+    def total(self) -> int:
+        return self.count + self.null_count
+
+    @property
+    def std(self) -> Optional[float]:
+        """Sample standard deviation (ddof=1), matching pandas."""
+        if self.count < 2:
+            return None
+        return float(np.sqrt(self.m2 / (self.count - 1)))
+
+    @property
+    def distinct_count(self) -> int:
+        # Heavy-hitter counters are an exact distinct set until they overflow
+        if self.frequent.exact:
+            return len(self.frequent.counters)
+        return self.distinct.estimate()
+
+    def update(self, series: pd.Series) -> None:
+        """Fold one chunk of the column into the running statistics."""
+        if self.numeric and not pd.api.types.is_numeric_dtype(series):
+            series = pd.to_numeric(series, errors='coerce')
+        values = series.dropna()
+        self.null_count += len(series) - len(values)
+        if len(values) == 0:
+            return
+
+        if self.numeric:
+            array = values.to_numpy(dtype=np.float64)
+            self._update_moments(len(array), float(array.mean()), float(((array - array.mean()) ** 2).sum()))
+            chunk_min, chunk_max = float(array.min()), float(array.max())
+            self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+            self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+            self.quantiles.update(array)
+        else:
+            self.count += len(values)
+
+        self.distinct.update(values.to_numpy())
+        self.frequent.update(values)
+
+        if self.track_dates:
+            if pd.api.types.is_datetime64_any_dtype(values):
+                dates = values
+            else:
+                dates = pd.to_datetime(values.astype(str), format=self.date_format, errors='coerce').dropna()
+            if len(dates):
+                self.min_date = dates.min() if self.min_date is None else min(self.min_date, dates.min())
+                self.max_date = dates.max() if self.max_date is None else max(self.max_date, dates.max())
+
+    def empty_like(self) -> 'ColumnAccumulator':
+        """A fresh accumulator for the same column and sketch sizes, to fold a partial state into."""
+        return ColumnAccumulator(self.name, self.numeric, self.track_dates,
+                                 sketch_k=self.quantiles.k if self.numeric else 200,
+                                 hll_precision=self.distinct.precision, top_capacity=self.frequent.capacity,
+                                 date_format=self.date_format)
+
+    def update_in_chunks(self, series: pd.Series, chunk_rows: int) -> None:
+        """Fold a whole column in slices of chunk_rows, keeping temporaries bounded."""
+        for start in range(0, len(series), chunk_rows):
+            self.update(series.iloc[start:start + chunk_rows])
+
+    def _update_moments(self, n: int, mean: float, m2: float) -> None:
+        # Chan et al. parallel combination of Welford moments
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def merge(self, other: 'ColumnAccumulator') -> None:
+        """Combine the statistics of another accumulator for the same column."""
+        if self.numeric and other.count:
+            self._update_moments(other.count, other.mean, other.m2)
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+            self.quantiles.merge(other.quantiles)
+        else:
+            self.count += other.count
+        self.null_count += other.null_count
+        self.distinct.merge(other.distinct)
+        self.frequent.merge(other.frequent)
+        for attr, pick in (('min_date', min), ('max_date', max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            if theirs is not None:
+                setattr(self, attr, theirs if mine is None else pick(mine, theirs))
+
+    def outlier_fraction(self) -> float:
+        """Approximate share of values beyond 3 standard deviations, from the quantile sketch."""
+        std = self.std
+        if not self.numeric or not std:
+            return 0.0
+        below = self.quantiles.rank(np.nextafter(self.mean - 3 * std, -np.inf))
+        above = 1.0 - self.quantiles.rank(self.mean + 3 * std)
+        return below + above
+
+    def error_bounds(self) -> Dict[str, Any]:
+        """
+        Accuracy of the sketch-based statistics: relative standard error of the
+        distinct count (0 while it is still an exact count), single-sided rank
+        error of the quantiles at ~99% confidence, and the most any reported
+        top-value count can fall short of the true count.
+        """
+        bounds = {
+            'distinct_count_relative_error': 0.0 if self.frequent.exact else round(self.distinct.relative_error, 4),
+            'top_values_max_undercount': self.frequent.error_bound
+        }
+        if self.numeric:
+            bounds['quantile_rank_error'] = round(self.quantiles.normalized_rank_error, 4)
+        return bounds
+
+    def statistics(self, col_type: str, top_k: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Type-specific statistics in the same shape as the in-memory profiler.
+        Categorical value_counts are capped at top_k entries unless it is None.
+        """
+        if col_type == 'numeric':
+            if self.count == 0:
+                return {key: None for key in ('mean', 'median', 'std', 'min', 'max', 'q25', 'q75')}
+            q25, median, q75 = self.quantiles.quantiles([0.25, 0.5, 0.75])
+            return {
+                'mean': self.mean,
+                'median': median,
+                'std': self.std,
+                'min': self.min,
+                'max': self.max,
+                'q25': q25,
+                'q75': q75
+            }
+        if col_type == 'categorical':
+            counts = self.frequent.top(len(self.frequent.counters) if top_k is None else top_k)
+            return {
+                'top_values': dict(list(counts.items())[:5]),
+                'value_counts': counts,
+                'other_count': self.count - sum(counts.values()),
+                'distinct_count': self.distinct_count
+            }
+        if col_type == 'date':
+            if self.min_date is None:
+                return {'error': 'Could not parse dates'}
+            return {
+                'min_date': str(self.min_date),
+                'max_date': str(self.max_date),
+                'date_range_days': (self.max_date - self.min_date).days if self.count > 1 else None
+            }
+        return {}
+
+
+def top_counts(counts: pd.Series, k: int) -> pd.Series:
+    """
+    The k largest entries of a value -> count Series, highest first. The
+    candidates are selected with a partial sort (np.partition), so only k entries
+    are ever fully sorted; ties keep the order of `counts`.
+    """
+    values = counts.to_numpy()
+    if len(values) > k:
+        kth = len(values) - k
+        threshold = np.partition(values, kth)[kth]
+        above = np.flatnonzero(values > threshold)
+        ties = np.flatnonzero(values == threshold)[:k - len(above)]
+        selected = np.sort(np.concatenate([above, ties]))
+        counts, values = counts.iloc[selected], values[selected]
+    return counts.iloc[np.argsort(-values, kind='stable')]
+
+
+def sorted_quantiles(sorted_values: np.ndarray, probabilities: List[float]) -> List[float]:
+    """
+    Linearly interpolated quantiles of an already sorted float array, computed
+    exactly as numpy.quantile (and so Series.quantile) does, without re-partitioning.
+    """
+    n = len(sorted_values)
+    result = []
+    for probability in probabilities:
+        position = n * probability + (1 - probability) - 1
+        lower = int(np.floor(position))
+        upper = min(lower + 1, n - 1)
+        gamma = position - lower
+        low, high = sorted_values[lower], sorted_values[upper]
+        diff = high - low
+        result.append(float(high - diff * (1 - gamma) if gamma >= 0.5 else low + diff * gamma))
+    return result
+
+
+class ColumnProfile:
+    """
+    Everything the in-memory profiler reads about one column, computed once.
+
+    Numeric columns are sorted once for min, max, median, quartiles and the
+    distinct count, with mean, standard deviation and the 3-sigma outlier count
+    taken from the same array; other columns are counted once with value_counts
+    (unsorted, in first-seen order; see top_counts).
+    """
+
+    __slots__ = ('name', 'values', 'total', 'count', 'null_count', 'distinct_count', 'value_counts',
+                 'numeric', 'mean', 'std', 'min', 'max', 'q25', 'median', 'q75', 'outlier_count')
+
+    def __init__(self, name: Any, values: pd.Series, total: int):
+        self.name = name
+        self.values = values  # non-null values
+        self.total = total
+        self.count = len(values)
+        self.null_count = total - self.count
+        self.distinct_count = 0
+        self.value_counts: Optional[pd.Series] = None
+        self.numeric = pd.api.types.is_numeric_dtype(values.dtype)
+        self.mean = self.std = self.min = self.max = None
+        self.q25 = self.median = self.q75 = None
+        self.outlier_count = 0
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> 'ColumnProfile':
+        profile = cls(series.name, series.dropna(), len(series))
+        if profile.numeric:
+            profile._profile_numeric()
+        else:
+            counts = profile.values.value_counts(sort=False)
+            if isinstance(profile.values.dtype, pd.CategoricalDtype):
+                # Counted on the integer codes; drop categories absent from this data
+                counts = counts[counts > 0]
+            profile.value_counts = counts
+            profile.distinct_count = len(counts)
+        return profile
+
+    def extrapolate(self, total: int, null_count: Optional[int] = None) -> None:
+        """
+        Scale the counts of a sample profile to a column of `total` rows. Null,
+        value and outlier counts grow with the sample's shares (the null count
+        is replaced when the exact one is known); the distinct count stays the
+        sample's, a lower bound for the column.
+        """
+        if null_count is None:
+            null_count = int(round(self.null_count * total / self.total)) if self.total else 0
+        count = total - null_count
+        factor = count / self.count if self.count else 0.0
+        if self.value_counts is not None:
+            self.value_counts = (self.value_counts * factor).round().astype(np.int64)
+        self.outlier_count = int(round(self.outlier_count * factor))
+        self.total, self.null_count, self.count = total, null_count, count
+
+    def _profile_numeric(self) -> None:
+        if self.count == 0:
+            return
+        dtype = self.values.dtype
+        array = self.values.to_numpy() if isinstance(dtype, np.dtype) else self.values.to_numpy(dtype=np.float64)
+        ordered = np.sort(array)
+        self.distinct_count = 1 + int(np.count_nonzero(ordered[1:] != ordered[:-1]))
+        ordered = ordered.astype(np.float64, copy=False)
+        self.min, self.max = float(ordered[0]), float(ordered[-1])
+        self.median = float((ordered[(self.count - 1) // 2] + ordered[self.count // 2]) / 2)
+        self.q25, self.q75 = sorted_quantiles(ordered, [0.25, 0.75])
+        del ordered
+
+        values = array.astype(np.float64, copy=False)
+        self.mean = float(values.sum() / self.count)
+        if self.count > 1:
+            self.std = float(np.sqrt(((values - self.mean) ** 2).sum() / (self.count - 1)))
+            if self.std > 0:
+                low, high = self.mean - 3 * self.std, self.mean + 3 * self.std
+                self.outlier_count = int(((values < low) | (values > high)).sum())
+        else:
+            self.std = float('nan')
+
@@ -0,0 +1,49 @@
+"""
+Uniform row sampling for profiling heuristics.
+
+A reservoir is filled while rows stream past, chunk by chunk, so the sample is
+uniform over the whole dataset without knowing its length up front. The same
+seed over the same rows always yields the same sample.
+"""
+
+import numpy as np
+from typing import Optional
+
+
+class ReservoirSample:
+    """
+    Reservoir of at most `size` row positions (Algorithm R), vectorized per chunk.
+
+    Only positions are kept; callers take the sampled rows from their own data.
+    """
+
+    def __init__(self, size: int, seed: Optional[int] = 0):
+        self.size = size
+        self.seen = 0
+        self._positions = np.empty(size, dtype=np.int64)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, rows: int) -> None:
+        """Offer the next `rows` rows of the stream to the reservoir."""
+        start = self.seen
+        self.seen += rows
+        filled = min(start, self.size)
+
+        # Fill phase: the first `size` rows are all kept
+        take = min(self.size - filled, rows)
+        if take > 0:
+            self._positions[filled:filled + take] = np.arange(start, start + take)
+        if take == rows:
+            return
+
+        # Row i replaces a random slot with probability size / (i + 1); later rows win a slot
+        candidates = np.arange(start + take, self.seen)
+        slots = self._rng.integers(0, candidates + 1)
+        replacing = np.flatnonzero(slots < self.size)[::-1]
+        slots, last = np.unique(slots[replacing], return_index=True)
+        self._positions[slots] = candidates[replacing[last]]
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Sampled row positions in ascending order."""
+        return np.sort(self._positions[:min(self.seen, self.size)])
@@ -0,0 +1,88 @@
+"""
+Zero-copy byte buffer helpers for the ingestion path.
+"""
+
+import io
+import mmap
+from typing import BinaryIO, Union
+
+ByteSource = Union[bytes, bytearray, memoryview, BinaryIO]
+
+
+def as_memoryview(source: ByteSource) -> memoryview:
+    """
+    Expose an upload as a flat byte memoryview without copying it.
+
+    Bytes-like objects are wrapped directly, in-memory streams share their buffer,
+    and file-backed streams (including spooled uploads that rolled over to disk)
+    are memory-mapped. Only streams with neither are read into memory.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).cast('B')
+
+    if hasattr(source, 'getbuffer'):
+        return source.getbuffer().cast('B')
+
+    try:
+        fileno = source.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fileno = None
+    if fileno is not None:
+        if hasattr(source, 'flush'):
+            # Spooled uploads roll over to a buffered temp file; make it visible to mmap
+            source.flush()
+        try:
+            return memoryview(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
+        except ValueError:
+            # Empty files cannot be mapped
+            return memoryview(b'')
+
+    source.seek(0)
+    return memoryview(source.read())
+
+
+class BufferReader(io.RawIOBase):
+    """Read-only, seekable file object over a memoryview; reads copy only the requested range."""
+
+    def __init__(self, buffer: memoryview):
+        self._buffer = buffer
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        size = min(len(target), len(self._buffer) - self._position)
+        if size <= 0:
+            return 0
+        target[:size] = self._buffer[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            self._position = len(self._buffer) + offset
+        self._position = max(self._position, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+def open_buffer(buffer: memoryview, buffer_size: int = 1 << 20) -> io.BufferedReader:
+    """
+    Buffered binary reader over a memoryview, suitable for pandas/pyarrow readers.
+
+    Sources that know how to open themselves (compressed uploads) return their own
+    decompressing stream instead.
+    """
+    if hasattr(buffer, 'open'):
+        return buffer.open()
+    return io.BufferedReader(BufferReader(buffer), buffer_size=buffer_size)
@@ -97,8 +97,8 @@ class ChartDataProcessor:
             datasets = []
             
             if group_by and group_by in df.columns:
-                # Group data by specified column
-                grouped = df.groupby(group_by)
+                # Group data by specified column; observed=True skips empty categories
+                grouped = df.groupby(group_by, observed=True)
                 for group_name, group_df in grouped:
                     data_points = self._dataframe_to_data_points(
                         group_df, x_column, y_column
@@ -149,7 +149,7 @@ class ChartDataProcessor:
             
             if group_by and group_by in df.columns:
                 # Group and aggregate
-                grouped = df.groupby(group_by)
+                grouped = df.groupby(group_by, observed=True)
                 if aggregation_type == 'sum':
                     result = grouped['value'].sum()
                 elif aggregation_type == 'mean':
@@ -0,0 +1,166 @@
+"""
+Compressed upload handling for Vibe Analytics Studio.
+
+gzip, zstd and zip-wrapped exports are kept compressed on disk and inflated as a
+stream while they are parsed. Every decompressing reader enforces a size limit,
+so an upload is bounded by both its compressed and its decompressed size.
+"""
+
+import gzip
+import io
+import struct
+import zipfile
+from typing import BinaryIO, Optional, Tuple
+
+from app.utils.buffers import BufferReader
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# File suffix -> compression format
+COMPRESSION_SUFFIXES = {'gz': 'gzip', 'zst': 'zstd', 'zip': 'zip'}
+COMPRESSION_FORMATS = {value: key for key, value in COMPRESSION_SUFFIXES.items()}
+DECOMPRESS_BLOCK_SIZE = 1024 * 1024
+
+
+class DecompressionLimitError(ValueError):
+    """Raised when an upload inflates past the allowed size."""
+
+
+def split_extension(filename: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a filename into (data extension, compression format).
+
+    'sales.csv.gz' -> ('csv', 'gzip'), 'sales.csv' -> ('csv', None) and
+    'export.zip' -> ('', 'zip'), where the data format comes from the archive member.
+    """
+    parts = filename.lower().rsplit('.', 2)
+    if len(parts) > 1 and parts[-1] in COMPRESSION_SUFFIXES:
+        return (parts[-2] if len(parts) > 2 else ''), COMPRESSION_SUFFIXES[parts[-1]]
+    return (parts[-1] if len(parts) > 1 else ''), None
+
+
+def zip_data_member(archive: zipfile.ZipFile) -> zipfile.ZipInfo:
+    """The single data file inside a zip upload, ignoring directories and macOS metadata."""
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+        and not info.filename.rsplit('/', 1)[-1].startswith('.')
+    ]
+    if len(members) != 1:
+        raise ValueError(f"Zip uploads must contain exactly one data file, found {len(members)}")
+    return members[0]
+
+
+class _LimitedReader(io.RawIOBase):
+    """Pass-through reader that fails once more than max_size bytes have been read."""
+
+    def __init__(self, stream: BinaryIO, max_size: Optional[int]):
+        self._stream = stream
+        self._max_size = max_size
+        self._read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        data = self._stream.read(len(target))
+        size = len(data)
+        self._read += size
+        if self._max_size is not None and self._read > self._max_size:
+            raise DecompressionLimitError(
+                f"Decompressed file too large. Maximum size: {self._max_size // (1024 * 1024)}MB"
+            )
+        target[:size] = data
+        return size
+
+    def close(self) -> None:
+        self._stream.close()
+        super().close()
+
+
+def open_decompressed(source: BinaryIO, compression: str, max_size: Optional[int] = None) -> io.BufferedReader:
+    """Buffered reader that inflates a compressed binary stream on the fly."""
+    if compression == 'gzip':
+        stream = gzip.GzipFile(fileobj=source, mode='rb')
+    elif compression == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstd uploads require the zstandard package")
+        stream = zstandard.ZstdDecompressor().stream_reader(source, read_across_frames=True, closefd=False)
+    elif compression == 'zip':
+        archive = zipfile.ZipFile(source)
+        stream = archive.open(zip_data_member(archive))
+    else:
+        raise ValueError(f"Unsupported compression: {compression}")
+    return io.BufferedReader(_LimitedReader(stream, max_size), buffer_size=DECOMPRESS_BLOCK_SIZE)
+
+
+def measure_decompressed_size(source: BinaryIO, compression: str, max_size: Optional[int] = None) -> int:
+    """Inflate a stream without keeping it, returning its size; raises past max_size."""
+    size = 0
+    with open_decompressed(source, compression, max_size) as reader:
+        for block in iter(lambda: reader.read(DECOMPRESS_BLOCK_SIZE), b''):
+            size += len(block)
+    return size
+
+
+class CompressedBuffer:
+    """
+    Compressed upload bytes that read like the plain upload.
+
+    open() returns a fresh decompressing stream, prefix slices inflate only the
+    bytes they need, and read_all() materialises the whole payload for readers
+    that need random access.
+    """
+
+    def __init__(self, buffer: memoryview, compression: str, max_size: Optional[int] = None):
+        self.buffer = buffer
+        self.compression = compression
+        self.max_size = max_size
+
+    def open(self) -> io.BufferedReader:
+        return open_decompressed(BufferReader(self.buffer), self.compression, self.max_size)
+
+    def __getitem__(self, key) -> bytes:
+        if not isinstance(key, slice) or key.start not in (None, 0) or key.step not in (None, 1) or key.stop is None:
+            raise TypeError("CompressedBuffer only supports prefix slices")
+        with self.open() as reader:
+            return reader.read(key.stop)
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.read_all())
+
+    def read_all(self) -> memoryview:
+        data = bytearray()
+        with self.open() as reader:
+            for block in iter(lambda: reader.read(DECOMPRESS_BLOCK_SIZE), b''):
+                data += block
+        return memoryview(data)
+
+    @property
+    def data_extension(self) -> str:
+        """Extension of the archived file for zip uploads, '' otherwise."""
+        if self.compression != 'zip':
+            return ''
+        with zipfile.ZipFile(BufferReader(self.buffer)) as archive:
+            return split_extension(zip_data_member(archive).filename)[0]
+
+    def size_hint(self) -> Optional[int]:
+        """Decompressed size declared by the container, without inflating anything."""
+        try:
+            if self.compression == 'gzip' and len(self.buffer) >= 4:
+                # ISIZE trailer: size modulo 2**32
+                return struct.unpack('<I', self.buffer[-4:])[0]
+            if self.compression == 'zip':
+                with zipfile.ZipFile(BufferReader(self.buffer)) as archive:
+                    return zip_data_member(archive).file_size
+            if self.compression == 'zstd' and ZSTD_AVAILABLE:
+                size = zstandard.frame_content_size(bytes(self.buffer[:18]))
+                return size if size >= 0 else None
+        except Exception:
+            # A damaged container surfaces as a parse error later; the hint is best effort
+            return None
+        return None
@@ -0,0 +1,191 @@
+"""
+Columnar cache of cleaned datasets for Vibe Analytics Studio.
+
+After an upload has been parsed and cleaned once, the typed DataFrame is stored
+as a Feather (Arrow IPC) file under FILE_PROCESSED_DIR/datasets, keyed by fileID
+and the SHA-256 of the source bytes. Later readers load only the columns they
+need from that file instead of re-running encoding detection, parsing and
+cleaning on the original upload.
+
+Files are written uncompressed and read through a memory map, so column reads
+touch only the pages of the requested columns and concurrent readers share them
+in the OS page cache.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from app.utils.buffers import as_memoryview
+from config.settings import settings
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+class DatasetCache:
+    """Persisted Feather cache of cleaned DataFrames keyed by fileID and content hash."""
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.DATASET_CACHE_ENABLED and PYARROW_AVAILABLE
+
+    @staticmethod
+    def hash_buffer(buffer) -> str:
+        """SHA-256 of a bytes-like object; memoryviews are hashed without copying."""
+        return hashlib.sha256(buffer).hexdigest()
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        """SHA-256 of a file, hashed straight from a read-only memory map."""
+        with open(path, 'rb') as f:
+            return DatasetCache.hash_buffer(as_memoryview(f))
+
+    @staticmethod
+    def get_dataset_path(fileID: str, content_hash: str) -> str:
+        return os.path.join(settings.DATASET_CACHE_DIR, f"{fileID}-{content_hash[:16]}.feather")
+
+    @staticmethod
+    def _get_manifest_path(fileID: str) -> str:
+        return os.path.join(settings.DATASET_CACHE_DIR, f"{fileID}.json")
+
+    @staticmethod
+    def get_manifest(fileID: str) -> Optional[Dict[str, Any]]:
+        path = DatasetCache._get_manifest_path(fileID)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_manifest(fileID: str, manifest: Dict[str, Any]) -> None:
+        path = DatasetCache._get_manifest_path(fileID)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def save(fileID: str, df: pd.DataFrame, content_hash: str, source_path: Optional[str] = None) -> Optional[str]:
+        """
+        Persist a cleaned DataFrame. Returns the dataset path, or None when the cache
+        is disabled or the frame cannot be represented in Arrow.
+        """
+        if not DatasetCache.is_enabled():
+            return None
+
+        dataset_path = DatasetCache.get_dataset_path(fileID, content_hash)
+        tmp_path = f"{dataset_path}.tmp"
+        frame = df.reset_index(drop=True)
+        try:
+            try:
+                frame.to_feather(tmp_path, compression='uncompressed')
+            except (TypeError, ValueError):
+                # Mixed-type object columns: store them as strings
+                frame = DatasetCache._stringify_mixed_columns(frame)
+                frame.to_feather(tmp_path, compression='uncompressed')
+            os.replace(tmp_path, dataset_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+        previous = DatasetCache.get_manifest(fileID)
+        manifest = {
+            'fileID': fileID,
+            'content_hash': content_hash,
+            'path': dataset_path,
+            'format': 'feather',
+            'compression': 'uncompressed',
+            'rows': len(frame),
+            'columns': [str(col) for col in frame.columns],
+            'dtypes': {str(col): str(dtype) for col, dtype in frame.dtypes.items()},
+            'created_at': datetime.utcnow().isoformat(),
+        }
+        if source_path and os.path.exists(source_path):
+            stat = os.stat(source_path)
+            manifest['source_size'] = stat.st_size
+            manifest['source_mtime_ns'] = stat.st_mtime_ns
+        DatasetCache._write_manifest(fileID, manifest)
+
+        if previous and previous.get('path') != dataset_path and os.path.exists(previous['path']):
+            os.remove(previous['path'])
+        return dataset_path
+
+    @staticmethod
+    def load(fileID: str, columns: Optional[List[str]] = None, source_path: Optional[str] = None,
+             arrow_backed: bool = False, nrows: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        Load a cached dataset through a memory map, reading only `columns` and the
+        first `nrows` rows when given.
+
+        With arrow_backed=True the returned columns use Arrow dtypes that point
+        straight into the mapping instead of being copied into NumPy arrays.
+
+        Returns None on a miss: no cache entry, the cache disabled, or a source file
+        whose content hash no longer matches the cached one.
+        """
+        if not DatasetCache.is_enabled():
+            return None
+        manifest = DatasetCache.get_manifest(fileID)
+        if not manifest or not os.path.exists(manifest['path']):
+            return None
+        if source_path and not DatasetCache._is_fresh(fileID, manifest, source_path):
+            return None
+        if columns is not None:
+            missing = [col for col in columns if col not in manifest['columns']]
+            if missing:
+                raise KeyError(f"Columns not in dataset: {', '.join(missing)}")
+        from pyarrow import feather
+        table = feather.read_table(manifest['path'], columns=columns, memory_map=True)
+        if nrows is not None:
+            table = table.slice(0, nrows)
+        return table.to_pandas(types_mapper=pd.ArrowDtype) if arrow_backed else table.to_pandas()
+
+    @staticmethod
+    def _is_fresh(fileID: str, manifest: Dict[str, Any], source_path: str) -> bool:
+        """Cheap size/mtime check first; rehash the source only when those changed."""
+        if not os.path.exists(source_path):
+            return False
+        stat = os.stat(source_path)
+        if stat.st_size == manifest.get('source_size') and stat.st_mtime_ns == manifest.get('source_mtime_ns'):
+            return True
+        if DatasetCache.hash_file(source_path) != manifest['content_hash']:
+            return False
+        # Touched but unchanged: remember the new stat so the next check stays cheap
+        manifest['source_size'] = stat.st_size
+        manifest['source_mtime_ns'] = stat.st_mtime_ns
+        DatasetCache._write_manifest(fileID, manifest)
+        return True
+
+    @staticmethod
+    def invalidate(fileID: str) -> bool:
+        """Remove the cached dataset and manifest for fileID. Return True if anything was removed."""
+        removed_any = False
+        manifest = DatasetCache.get_manifest(fileID)
+        if manifest and os.path.exists(manifest.get('path', '')):
+            os.remove(manifest['path'])
+            removed_any = True
+        manifest_path = DatasetCache._get_manifest_path(fileID)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+            removed_any = True
+        return removed_any
+
+    @staticmethod
+    def _stringify_mixed_columns(df: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
+        for col in df.columns:
+            if pd.api.types.is_object_dtype(df[col].dtype) and \
+                    pd.api.types.infer_dtype(df[col], skipna=True) not in ('string', 'empty'):
+                df[col] = df[col].map(lambda value: None if pd.isna(value) else str(value))
+        return df
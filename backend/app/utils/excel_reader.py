@@ -0,0 +1,205 @@
+"""
+Streaming, sheet-aware Excel reading for Vibe Analytics Studio.
+
+Workbooks are read row by row through a read-only engine instead of having
+pandas materialise every cell first: python-calamine when it is installed,
+otherwise openpyxl in read-only mode. Legacy .xls files without calamine fall
+back to pandas. Every sheet can be enumerated and read, sheets are read in
+parallel, and a row cap keeps previews of large exports cheap.
+"""
+
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+from app.utils.buffers import open_buffer
+from config.settings import settings
+
+try:
+    from python_calamine import CalamineWorkbook
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+SHEET_PROBE_ROWS = 20  # Data rows read from every sheet to find and size the ones with data
+
+
+class ExcelReader:
+    """Row-streaming reader over an in-memory or memory-mapped workbook."""
+
+    @staticmethod
+    def engine(extension: str = 'xlsx') -> str:
+        """Fastest installed engine for the extension: 'calamine', 'openpyxl' or 'pandas'."""
+        if CALAMINE_AVAILABLE:
+            return 'calamine'
+        if extension == 'xlsx' and OPENPYXL_AVAILABLE:
+            return 'openpyxl'
+        return 'pandas'
+
+    @staticmethod
+    def _open_workbook(buffer: memoryview, engine: str):
+        if engine == 'calamine':
+            return CalamineWorkbook.from_filelike(open_buffer(buffer))
+        return openpyxl.load_workbook(open_buffer(buffer), read_only=True, data_only=True)
+
+    @staticmethod
+    def list_sheets(buffer: memoryview, extension: str = 'xlsx') -> List[str]:
+        """Sheet names in workbook order, without reading any cells."""
+        engine = ExcelReader.engine(extension)
+        if engine == 'pandas':
+            with pd.ExcelFile(open_buffer(buffer)) as workbook:
+                return [str(name) for name in workbook.sheet_names]
+        workbook = ExcelReader._open_workbook(buffer, engine)
+        try:
+            return list(workbook.sheet_names if engine == 'calamine' else workbook.sheetnames)
+        finally:
+            if engine == 'openpyxl':
+                workbook.close()
+
+    @staticmethod
+    def survey_sheets(buffer: memoryview, extension: str = 'xlsx',
+                      probe_rows: int = SHEET_PROBE_ROWS) -> List[Dict[str, Any]]:
+        """
+        Name, data rows and columns of every sheet, in workbook order.
+
+        The first probe_rows data rows of all sheets are read in parallel, so a sheet
+        is never judged empty from its stored dimension record alone, which some
+        writers leave stale or omit. Sheets shorter than the probe get exact counts;
+        longer ones take the dimension record when it agrees with the probe, else None.
+        """
+        recorded = ExcelReader._recorded_rows(buffer, extension)
+        sheets = []
+        for name, probe in ExcelReader.read_sheets(buffer, nrows=probe_rows, extension=extension).items():
+            rows = len(probe)
+            if rows >= probe_rows:
+                rows = recorded[name] if recorded.get(name, -1) >= rows else None
+            sheets.append({'name': name, 'rows': rows, 'columns': len(probe.columns)})
+        return sheets
+
+    @staticmethod
+    def _recorded_rows(buffer: memoryview, extension: str) -> Dict[str, Optional[int]]:
+        """Data rows per sheet from the .xlsx dimension records; empty when they cannot be read cheaply."""
+        if extension != 'xlsx' or not OPENPYXL_AVAILABLE:
+            return {}
+        workbook = ExcelReader._open_workbook(buffer, 'openpyxl')
+        try:
+            return {sheet.title: None if sheet.max_row is None else max(sheet.max_row - 1, 0)
+                    for sheet in workbook.worksheets}
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def iter_rows(buffer: memoryview, sheet: Optional[str] = None, extension: str = 'xlsx') -> Iterator[tuple]:
+        """Lazily yield the raw cell values of one sheet (the first when sheet is None) as tuples."""
+        engine = ExcelReader.engine(extension)
+        if engine == 'pandas':
+            frame = pd.read_excel(open_buffer(buffer), sheet_name=sheet if sheet is not None else 0, header=None)
+            yield from frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+            return
+
+        workbook = ExcelReader._open_workbook(buffer, engine)
+        try:
+            if engine == 'calamine':
+                worksheet = workbook.get_sheet_by_name(sheet if sheet is not None else workbook.sheet_names[0])
+                # Calamine reports empty cells as ''
+                for row in worksheet.iter_rows():
+                    yield tuple(None if cell == '' else cell for cell in row)
+            else:
+                worksheet = workbook[sheet] if sheet is not None else workbook.worksheets[0]
+                # Read to the last stored row, not the dimension record, which can be stale
+                worksheet.reset_dimensions()
+                yield from worksheet.iter_rows(values_only=True)
+        finally:
+            if engine == 'openpyxl':
+                workbook.close()
+
+    @staticmethod
+    def iter_batches(buffer: memoryview, sheet: Optional[str] = None, batch_rows: Optional[int] = None,
+                     nrows: Optional[int] = None, extension: str = 'xlsx') -> Iterator[pd.DataFrame]:
+        """
+        Yield one sheet as DataFrames of at most batch_rows rows.
+
+        The first non-blank row is the header; nrows caps the number of data rows
+        read, so the rest of the sheet is never parsed.
+        """
+        batch_rows = batch_rows or settings.STREAMING_CHUNK_ROWS
+        rows = ExcelReader.iter_rows(buffer, sheet, extension)
+        header = None
+        for row in rows:
+            if any(cell is not None for cell in row):
+                header = ExcelReader._header(row)
+                break
+        if header is None:
+            return
+        if nrows is not None:
+            rows = itertools.islice(rows, nrows)
+
+        yielded = False
+        while True:
+            batch = list(itertools.islice(rows, batch_rows))
+            if not batch:
+                break
+            yielded = True
+            yield ExcelReader._to_frame(batch, header)
+        if not yielded:
+            yield ExcelReader._to_frame([], header)
+
+    @staticmethod
+    def read_sheet(buffer: memoryview, sheet: Optional[str] = None, nrows: Optional[int] = None,
+                   extension: str = 'xlsx') -> pd.DataFrame:
+        """Read one sheet into a DataFrame, optionally capped at nrows data rows."""
+        frames = list(ExcelReader.iter_batches(buffer, sheet, nrows=nrows, extension=extension))
+        if not frames:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def read_sheets(buffer: memoryview, sheets: Optional[List[str]] = None, nrows: Optional[int] = None,
+                    extension: str = 'xlsx', max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Read several sheets (all of them by default) concurrently, in workbook order.
+
+        Each worker opens its own read-only view of the shared buffer, so sheets
+        decompress and parse independently.
+        """
+        if sheets is None:
+            sheets = ExcelReader.list_sheets(buffer, extension)
+        workers = min(max_workers or settings.EXCEL_MAX_WORKERS, len(sheets))
+        if workers <= 1:
+            return {name: ExcelReader.read_sheet(buffer, name, nrows, extension) for name in sheets}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            frames = executor.map(lambda name: ExcelReader.read_sheet(buffer, name, nrows, extension), sheets)
+            return dict(zip(sheets, frames))
+
+    @staticmethod
+    def _header(row: tuple) -> List[Any]:
+        """Header names from a row, naming blanks and de-duplicating repeats like pandas."""
+        names = []
+        seen: Dict[str, int] = {}
+        for position, cell in enumerate(row):
+            name = f"Unnamed: {position}" if cell is None else cell
+            key = str(name)
+            if key in seen:
+                seen[key] += 1
+                name = f"{key}.{seen[key]}"
+            else:
+                seen[key] = 0
+            names.append(name)
+        return names
+
+    @staticmethod
+    def _to_frame(rows: List[tuple], header: List[Any]) -> pd.DataFrame:
+        width = len(header)
+        rows = [row if len(row) == width else (tuple(row[:width]) + (None,) * (width - len(row))) for row in rows]
+        frame = pd.DataFrame.from_records(rows, columns=range(width)) if rows else pd.DataFrame(columns=range(width))
+        frame.columns = header
+        return frame
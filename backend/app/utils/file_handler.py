@@ -3,25 +3,39 @@ File handling utilities for Vibe Analytics Studio.
 """
 
 import pandas as pd
+import hashlib
 import os
 import json
 import uuid
+import zipfile
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Tuple, Union
 from werkzeug.utils import secure_filename
+from app.utils.buffers import as_memoryview
+from app.utils.compression import (
+    COMPRESSION_FORMATS, CompressedBuffer, measure_decompressed_size, split_extension, zip_data_member
+)
+from app.utils.dataset_cache import DatasetCache
+from app.utils.profile_checkpoint import APPEND_HEAD_BYTES, ProfileCheckpoint
 from config.settings import settings
 
 class FileHandler:
     """Utility class for handling file uploads and processing."""
     
-    ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls', 'json'}
+    ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls', 'json', 'jsonl', 'ndjson'}
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+    SAVE_BLOCK_SIZE = 1024 * 1024
     
     @staticmethod
     def allowed_file(filename: str) -> bool:
-        """Check if the file extension is allowed."""
-        return '.' in filename and \
-               filename.rsplit('.', 1)[1].lower() in FileHandler.ALLOWED_EXTENSIONS
+        """Check if the file extension is allowed, looking through a .gz/.zst/.zip suffix."""
+        if '.' not in filename:
+            return False
+        extension, compression = split_extension(filename)
+        if compression == 'zip' and not extension:
+            # The archived file is checked in validate_file
+            return True
+        return extension in FileHandler.ALLOWED_EXTENSIONS
     
     @staticmethod
     def validate_file(file) -> Dict[str, Any]:
@@ -43,10 +57,38 @@ class FileHandler:
         if file_size > FileHandler.MAX_FILE_SIZE:
             raise ValueError(f"File too large. Maximum size: {FileHandler.MAX_FILE_SIZE // (1024*1024)}MB")
         
+        extension, compression = split_extension(file.filename)
+        if not compression:
+            return {
+                'filename': secure_filename(file.filename),
+                'size': file_size,
+                'extension': extension
+            }
+        
+        # Compressed uploads must also fit the limit once inflated
+        source = getattr(file, 'stream', file)
+        try:
+            if compression == 'zip':
+                with zipfile.ZipFile(source) as archive:
+                    extension = split_extension(zip_data_member(archive).filename)[0]
+                if extension not in FileHandler.ALLOWED_EXTENSIONS:
+                    raise ValueError(f"File type not allowed inside zip. Allowed types: {', '.join(FileHandler.ALLOWED_EXTENSIONS)}")
+                source.seek(0)
+            uncompressed_size = measure_decompressed_size(source, compression, FileHandler.MAX_FILE_SIZE)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Could not decompress file: {str(e)}")
+        finally:
+            file.seek(0)
+        
         return {
             'filename': secure_filename(file.filename),
             'size': file_size,
-            'extension': file.filename.rsplit('.', 1)[1].lower()
+            'extension': f"{extension}.{COMPRESSION_FORMATS[compression]}",
+            'format': extension,
+            'compression': compression,
+            'uncompressed_size': uncompressed_size
         }
     
     @staticmethod
@@ -61,6 +103,8 @@ class FileHandler:
                 return pd.read_excel(file)
             elif extension == 'json':
                 return pd.read_json(file)
+            elif extension in ['jsonl', 'ndjson']:
+                return pd.read_json(file, lines=True)
             else:
                 raise ValueError(f"Unsupported file type: {extension}")
                 
@@ -101,6 +145,102 @@ class FileHandler:
         filename = f"{fileID}.{ext}"
         return os.path.join(settings.FILE_UPLOADS_DIR, filename)
 
+    @staticmethod
+    def stage_upload(file) -> Tuple[str, str]:
+        """
+        Stream an upload into the temp directory, hashing it on the way.
+
+        Returns (temp_path, sha256 hex digest). The caller either moves the file into
+        place with commit_upload or discards it when the hash matches a stored upload.
+        """
+        temp_path = os.path.join(settings.FILE_TEMP_DIR, f"{uuid.uuid4()}.part")
+        digest = hashlib.sha256()
+        file.seek(0)
+        try:
+            with open(temp_path, 'wb') as out:
+                for block in iter(lambda: file.read(FileHandler.SAVE_BLOCK_SIZE), b''):
+                    digest.update(block)
+                    out.write(block)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return temp_path, digest.hexdigest()
+
+    @staticmethod
+    def commit_upload(temp_path: str, fileID: str, ext: str) -> str:
+        """Move a staged upload to its permanent path and return that path."""
+        upload_path = FileHandler.get_upload_path(fileID, ext)
+        os.replace(temp_path, upload_path)
+        return upload_path
+
+    @staticmethod
+    def _get_hash_index_path(content_hash: str) -> str:
+        return os.path.join(settings.FILE_METADATA_HASHES_DIR, f"{content_hash}.json")
+
+    @staticmethod
+    def register_content_hash(content_hash: str, fileID: str) -> None:
+        """Record fileID as the stored copy of content with this hash."""
+        path = FileHandler._get_hash_index_path(content_hash)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'content_hash': content_hash, 'fileID': fileID}, f)
+
+    @staticmethod
+    def find_upload_by_hash(content_hash: str) -> Optional[Dict[str, Any]]:
+        """Metadata of the stored upload with this content hash, or None. Stale entries are dropped."""
+        path = FileHandler._get_hash_index_path(content_hash)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                fileID = json.load(f)['fileID']
+            meta = FileHandler.get_upload_metadata(fileID)
+            if os.path.exists(FileHandler.get_upload_path(fileID, meta['ext'])):
+                return meta
+        except (OSError, ValueError, KeyError, FileNotFoundError):
+            pass
+        os.remove(path)
+        return None
+
+    @staticmethod
+    def map_upload(fileID: str) -> memoryview:
+        """
+        Memory-map a stored upload read-only.
+
+        The bytes stay in the OS page cache rather than in process memory, so
+        workers reading the same upload share pages and the kernel can evict
+        them under pressure.
+        """
+        meta = FileHandler.get_upload_metadata(fileID)
+        path = FileHandler.get_upload_path(fileID, meta['ext'])
+        if not os.path.exists(path):
+            raise FileNotFoundError("Upload file not found")
+        with open(path, 'rb') as f:
+            return as_memoryview(f)
+
+    @staticmethod
+    def open_upload_source(fileID: str) -> Tuple[Union[memoryview, CompressedBuffer], str]:
+        """
+        Memory-map a stored upload and return (source, data extension). Compressed
+        uploads come back as a CompressedBuffer that inflates as it is read.
+        """
+        meta = FileHandler.get_upload_metadata(fileID)
+        extension, compression = split_extension(f"{fileID}.{meta['ext']}")
+        buffer = FileHandler.map_upload(fileID)
+        if compression:
+            return CompressedBuffer(buffer, compression, max_size=FileHandler.MAX_FILE_SIZE), extension
+        return buffer, extension
+
+    @staticmethod
+    def iter_upload_range(mapping: memoryview, start: int = 0, stop: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Yield bytes [start, stop) of a mapped upload in SAVE_BLOCK_SIZE pieces, so a
+        response streams from the page cache without holding the range in memory.
+        """
+        stop = mapping.nbytes if stop is None else stop
+        for offset in range(start, stop, FileHandler.SAVE_BLOCK_SIZE):
+            yield bytes(mapping[offset:min(offset + FileHandler.SAVE_BLOCK_SIZE, stop)])
+
     @staticmethod
     def _get_upload_metadata_path(fileID: str) -> str:
         return os.path.join(settings.FILE_METADATA_UPLOADS_DIR, f"{fileID}.json")
@@ -149,19 +289,33 @@ class FileHandler:
 
     @staticmethod
     def delete_upload_set(fileID: str) -> bool:
-        """Delete the uploaded file and its metadata. Return True if any file was removed."""
+        """Delete the uploaded file, its metadata and cached derivatives. Return True if any file was removed."""
         removed_any = False
-        # Remove file
+        # Remove file and its content hash index entry
         try:
             meta = FileHandler.get_upload_metadata(fileID)
             ext = meta.get('ext')
             upload_path = FileHandler.get_upload_path(fileID, ext)
             if os.path.exists(upload_path):
+                # Drop the incremental-analysis checkpoint, found by the upload's leading bytes
+                with open(upload_path, 'rb') as f:
+                    ProfileCheckpoint.invalidate(f.read(APPEND_HEAD_BYTES))
                 os.remove(upload_path)
                 removed_any = True
+            if meta.get('content_hash'):
+                hash_path = FileHandler._get_hash_index_path(meta['content_hash'])
+                if os.path.exists(hash_path):
+                    with open(hash_path, 'r', encoding='utf-8') as f:
+                        indexed_fileID = json.load(f).get('fileID')
+                    if indexed_fileID == fileID:
+                        os.remove(hash_path)
         except FileNotFoundError:
             pass
 
+        # Remove cached dataset
+        if DatasetCache.invalidate(fileID):
+            removed_any = True
+
         # Remove metadata
         meta_path = FileHandler._get_upload_metadata_path(fileID)
         if os.path.exists(meta_path):
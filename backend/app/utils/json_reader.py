@@ -0,0 +1,182 @@
+"""
+Streaming JSON and JSON Lines reading for Vibe Analytics Studio.
+
+Records are decoded incrementally and collected into DataFrame batches, so
+memory scales with the batch size rather than the document size. Nested
+objects are flattened into dotted column names ("customer.address.city") and
+arrays are kept as JSON text. JSON Lines are decoded line by line with orjson
+when it is installed; top-level arrays are split into elements with the C
+scanner of the standard library decoder.
+"""
+
+import codecs
+import itertools
+import json
+from typing import Any, Dict, Iterator, Optional
+
+import pandas as pd
+from app.utils.buffers import open_buffer
+from config.settings import settings
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+JSON_LINES_EXTENSIONS = {'jsonl', 'ndjson'}
+READ_BLOCK_SIZE = 1024 * 1024
+UTF8_BOM = codecs.BOM_UTF8
+
+
+def _loads(data):
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _dumps(value) -> str:
+    return orjson.dumps(value).decode('utf-8') if ORJSON_AVAILABLE else json.dumps(value, ensure_ascii=False)
+
+
+class JSONReader:
+    """Incremental reader for JSON arrays, single JSON documents and JSON Lines."""
+
+    @staticmethod
+    def detect_format(buffer: memoryview, extension: str = 'json') -> str:
+        """'lines' for JSON Lines, 'array' for a top-level array, otherwise 'document'."""
+        if extension in JSON_LINES_EXTENSIONS:
+            return 'lines'
+        head = bytes(buffer[:READ_BLOCK_SIZE]).lstrip(UTF8_BOM).lstrip()
+        if head.startswith(b'['):
+            return 'array'
+        # Several top-level values on separate lines: JSON Lines saved as .json
+        first_line, _, rest = head.partition(b'\n')
+        if rest.strip():
+            try:
+                _loads(first_line)
+                return 'lines'
+            except ValueError:
+                pass
+        return 'document'
+
+    @staticmethod
+    def iter_records(buffer: memoryview, extension: str = 'json') -> Iterator[Dict[str, Any]]:
+        """Lazily yield flattened records from the document."""
+        file_format = JSONReader.detect_format(buffer, extension)
+        if file_format == 'lines':
+            values = JSONReader._iter_lines(buffer)
+        elif file_format == 'array':
+            values = JSONReader._iter_array(buffer)
+        else:
+            values = JSONReader._document_records(_loads(bytes(buffer).lstrip(UTF8_BOM)))
+        for value in values:
+            yield JSONReader.flatten_record(value) if isinstance(value, dict) else {'value': value}
+
+    @staticmethod
+    def iter_batches(buffer: memoryview, batch_rows: Optional[int] = None, nrows: Optional[int] = None,
+                     extension: str = 'json') -> Iterator[pd.DataFrame]:
+        """Yield DataFrames of at most batch_rows flattened records, stopping after nrows records."""
+        batch_rows = batch_rows or settings.STREAMING_CHUNK_ROWS
+        records = JSONReader.iter_records(buffer, extension)
+        if nrows is not None:
+            records = itertools.islice(records, nrows)
+        while True:
+            batch = list(itertools.islice(records, batch_rows))
+            if not batch:
+                break
+            yield pd.DataFrame.from_records(batch)
+
+    @staticmethod
+    def read(buffer: memoryview, nrows: Optional[int] = None, extension: str = 'json') -> pd.DataFrame:
+        """Read the whole document (or its first nrows records) into one DataFrame."""
+        frames = list(JSONReader.iter_batches(buffer, nrows=nrows, extension=extension))
+        if not frames:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def flatten_record(record: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+        """Flatten nested objects into dotted keys; arrays become JSON text."""
+        flat = {}
+        for key, value in record.items():
+            name = f"{prefix}{key}"
+            if isinstance(value, dict):
+                if value:
+                    flat.update(JSONReader.flatten_record(value, f"{name}."))
+                else:
+                    flat[name] = None
+            elif isinstance(value, list):
+                flat[name] = _dumps(value)
+            else:
+                flat[name] = value
+        return flat
+
+    @staticmethod
+    def _iter_lines(buffer: memoryview) -> Iterator[Any]:
+        reader = open_buffer(buffer)
+        for number, line in enumerate(reader):
+            if number == 0:
+                line = line.lstrip(UTF8_BOM)
+            line = line.strip()
+            if line:
+                yield _loads(line)
+
+    @staticmethod
+    def _iter_array(buffer: memoryview) -> Iterator[Any]:
+        """Yield the elements of a top-level array, decoding one block of input at a time."""
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        reader = open_buffer(buffer)
+        pending = ''
+        position = 0
+        started = exhausted = False
+        while True:
+            if not exhausted:
+                block = reader.read(READ_BLOCK_SIZE)
+                exhausted = not block
+                pending = pending[position:] + text_decoder.decode(block, final=exhausted)
+                position = 0
+
+            while True:
+                # Skip whitespace, the opening bracket and separating commas
+                while position < len(pending) and (pending[position].isspace() or pending[position] == ','
+                                                   or (not started and pending[position] == '[')):
+                    started = started or pending[position] == '['
+                    position += 1
+                if position < len(pending) and pending[position] == ']':
+                    return
+                try:
+                    value, end = decoder.raw_decode(pending, position)
+                except json.JSONDecodeError:
+                    if exhausted:
+                        raise
+                    break
+                # A value ending exactly at the block boundary (e.g. a number) may continue
+                if end == len(pending) and not exhausted:
+                    break
+                position = end
+                yield value
+
+    @staticmethod
+    def _document_records(data: Any) -> Iterator[Any]:
+        """Records of a single JSON document: a wrapped record list, columns of values, or one record."""
+        if isinstance(data, list):
+            yield from data
+            return
+        if not isinstance(data, dict):
+            yield data
+            return
+        # {"data": [{...}, ...]}-style wrappers around the actual records
+        for value in data.values():
+            if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+                yield from value
+                return
+        # {"col": [v1, v2], ...} columns of equal length
+        lengths = {len(value) for value in data.values() if isinstance(value, list)}
+        if len(lengths) == 1 and all(isinstance(value, list) for value in data.values()):
+            columns = list(data)
+            for row in zip(*data.values()):
+                yield dict(zip(columns, row))
+            return
+        yield data
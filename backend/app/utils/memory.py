@@ -0,0 +1,75 @@
+"""
+Process memory measurement helpers.
+"""
+
+import os
+import sys
+import threading
+from typing import Dict
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss_bytes() -> int:
+    """Current resident set size of this process in bytes."""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    if resource is not None:
+        # High-water mark only; kilobytes on Linux, bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+    return 0
+
+
+class PeakMemoryTracker:
+    """
+    Context manager that samples resident memory on a background thread and
+    records the peak reached while the block runs.
+
+    The figures are process-wide, so concurrent requests in the same worker are
+    included; treat them as an upper bound for the tracked block.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self) -> 'PeakMemoryTracker':
+        self.baseline = self.peak = current_rss_bytes()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes())
+
+    def report(self) -> Dict[str, float]:
+        mb = 1024 * 1024
+        return {
+            'baseline_rss_mb': round(self.baseline / mb, 2),
+            'peak_rss_mb': round(self.peak / mb, 2),
+            'peak_delta_mb': round((self.peak - self.baseline) / mb, 2)
+        }
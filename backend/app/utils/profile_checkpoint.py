@@ -0,0 +1,134 @@
+"""
+Checkpoints of the streaming profiler for incremental reanalysis.
+
+After a CSV upload has been profiled chunk by chunk, the profiler state
+(column accumulators, row hashes, counters and dialect) is pickled under
+PROFILE_CHECKPOINT_DIR, keyed by the SHA-256 of the upload's first
+APPEND_HEAD_BYTES. A later upload with the same leading bytes is an append when
+its first `content_length` bytes hash to the checkpointed content hash and the
+old content ended on a row boundary; only the bytes after that are new rows.
+Checkpoints are removed with their upload and evicted least recently used
+first once they exceed PROFILE_CHECKPOINT_MAX_MB.
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Any, Dict, Optional, Tuple, Union
+
+from config.settings import settings
+
+APPEND_HEAD_BYTES = 64 * 1024  # Leading bytes that key a checkpoint; smaller uploads are not checkpointed
+CHECKPOINT_VERSION = 1
+
+
+class ProfileCheckpoint:
+    """Persisted profiler state of an upload, found again by uploads that extend it."""
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.INCREMENTAL_ANALYSIS_ENABLED
+
+    @staticmethod
+    def _get_path(buffer: Union[bytes, memoryview]) -> str:
+        head_hash = hashlib.sha256(buffer[:APPEND_HEAD_BYTES]).hexdigest()
+        return os.path.join(settings.PROFILE_CHECKPOINT_DIR, f"{head_hash[:32]}.pkl")
+
+    @staticmethod
+    def save(buffer: memoryview, state: Dict[str, Any]) -> Optional[str]:
+        """
+        Checkpoint the profiler state of `buffer`, replacing any earlier checkpoint
+        with the same leading bytes. Returns the path, or None when skipped.
+        """
+        if not ProfileCheckpoint.is_enabled() or buffer.nbytes < APPEND_HEAD_BYTES:
+            return None
+        path = ProfileCheckpoint._get_path(buffer)
+        checkpoint = {
+            **state,
+            'version': CHECKPOINT_VERSION,
+            'content_length': buffer.nbytes,
+            'content_hash': hashlib.sha256(buffer).hexdigest()
+        }
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        ProfileCheckpoint._evict(keep=path)
+        return path
+
+    @staticmethod
+    def invalidate(head: Union[bytes, memoryview]) -> bool:
+        """
+        Remove the checkpoint keyed by an upload's leading bytes (at least its first
+        APPEND_HEAD_BYTES). Return True if one was removed. Other uploads sharing
+        those bytes lose it too and are simply profiled in full next time.
+        """
+        path = ProfileCheckpoint._get_path(head)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @staticmethod
+    def _evict(keep: str) -> None:
+        """Delete the least recently used checkpoints until they fit PROFILE_CHECKPOINT_MAX_MB."""
+        entries = []
+        with os.scandir(settings.PROFILE_CHECKPOINT_DIR) as scan:
+            for entry in scan:
+                if entry.name.endswith('.pkl'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        budget = settings.PROFILE_CHECKPOINT_MAX_MB * 1024 * 1024
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= budget:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    @staticmethod
+    def find_append(buffer: memoryview) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        The checkpoint `buffer` extends and the offset of its first new row, or
+        None when no checkpointed upload is a strict, row-aligned prefix of it.
+        """
+        if not ProfileCheckpoint.is_enabled() or buffer.nbytes <= APPEND_HEAD_BYTES:
+            return None
+        path = ProfileCheckpoint._get_path(buffer)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                checkpoint = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            return None
+        # Mark it recently used for eviction
+        os.utime(path)
+
+        length = checkpoint['content_length']
+        if buffer.nbytes <= length or hashlib.sha256(buffer[:length]).hexdigest() != checkpoint['content_hash']:
+            return None
+        # The old last row must be complete: it either ended in a newline or is followed by one
+        if buffer[length - 1:length] in (b'\n', b'\r'):
+            # A '\n' completing a split '\r\n' reads as a blank line, which the parser skips
+            offset = length
+        elif buffer[length:length + 2] == b'\r\n':
+            offset = length + 2
+        elif buffer[length:length + 1] in (b'\n', b'\r'):
+            offset = length + 1
+        else:
+            return None
+        return checkpoint, offset
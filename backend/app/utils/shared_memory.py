@@ -0,0 +1,43 @@
+"""
+Shared-memory hand-off of NumPy arrays to worker processes.
+
+The parent copies an array into a named shared memory block once; workers
+attach to the block by name and view it in place, so large columns never
+travel through the process pool's pipes as pickles.
+"""
+
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, Tuple
+
+import numpy as np
+
+
+class SharedArray:
+    """Create and attach named shared memory blocks holding one NumPy array."""
+
+    @staticmethod
+    def create(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Dict[str, Any]]:
+        """
+        Copy array into a new block. Returns the block, which the caller must
+        close() and unlink() once the workers are done, and a picklable handle.
+        """
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        return block, {'name': block.name, 'dtype': array.dtype.str, 'shape': array.shape}
+
+    @staticmethod
+    @contextmanager
+    def attach(handle: Dict[str, Any]) -> Iterator[np.ndarray]:
+        """
+        Read-only view of a shared array. The view and anything built on it
+        without copying must be released before the block is closed on exit.
+        """
+        block = shared_memory.SharedMemory(name=handle['name'])
+        array = np.ndarray(handle['shape'], dtype=np.dtype(handle['dtype']), buffer=block.buf)
+        array.flags.writeable = False
+        try:
+            yield array
+        finally:
+            del array
+            block.close()
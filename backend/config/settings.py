@@ -28,7 +28,7 @@ class Settings:
     # Align with FileHandler.MAX_FILE_SIZE (50MB)
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", str(50 * 1024 * 1024)))
     UPLOAD_FOLDER: str = os.getenv("UPLOAD_FOLDER", "uploads")
-    ALLOWED_EXTENSIONS: List[str] = field(default_factory=lambda: os.getenv("ALLOWED_EXTENSIONS", "csv,xlsx,xls,json").split(","))
+    ALLOWED_EXTENSIONS: List[str] = field(default_factory=lambda: os.getenv("ALLOWED_EXTENSIONS", "csv,xlsx,xls,json,jsonl,ndjson").split(","))
 
     # File Storage (Phase 1)
     FILE_STORAGE_ROOT: str = os.getenv("FILE_STORAGE_ROOT", os.path.join("file-storage"))
@@ -38,6 +38,64 @@ class Settings:
     FILE_METADATA_ROOT: str = os.path.join(FILE_STORAGE_ROOT, "metadata")
     FILE_METADATA_UPLOADS_DIR: str = os.path.join(FILE_METADATA_ROOT, "uploads")
     FILE_METADATA_DASHBOARDS_DIR: str = os.path.join(FILE_METADATA_ROOT, "dashboards")
+    # SHA-256 -> fileID index used to deduplicate identical uploads
+    FILE_METADATA_HASHES_DIR: str = os.path.join(FILE_METADATA_ROOT, "hashes")
+    UPLOAD_DEDUP_ENABLED: bool = os.getenv("UPLOAD_DEDUP_ENABLED", "true").lower() == "true"
+    # Cleaned, typed datasets cached in columnar form (requires pyarrow)
+    DATASET_CACHE_DIR: str = os.path.join(FILE_PROCESSED_DIR, "datasets")
+    DATASET_CACHE_ENABLED: bool = os.getenv("DATASET_CACHE_ENABLED", "true").lower() == "true"
+    # Streaming-profiler state of CSV uploads, so appended exports only profile their new rows
+    PROFILE_CHECKPOINT_DIR: str = os.path.join(FILE_PROCESSED_DIR, "checkpoints")
+    INCREMENTAL_ANALYSIS_ENABLED: bool = os.getenv("INCREMENTAL_ANALYSIS_ENABLED", "true").lower() == "true"
+    # Least recently used checkpoints are evicted once they take up more than this
+    PROFILE_CHECKPOINT_MAX_MB: int = int(os.getenv("PROFILE_CHECKPOINT_MAX_MB", "512"))
+
+    # File Processing
+    # Uploads at or above this size are profiled chunk by chunk instead of in one DataFrame
+    STREAMING_MIN_FILE_SIZE: int = int(os.getenv("STREAMING_MIN_FILE_SIZE", str(20 * 1024 * 1024)))
+    STREAMING_CHUNK_ROWS: int = int(os.getenv("STREAMING_CHUNK_ROWS", "50000"))
+    # "pandas" (single-threaded C parser) or "pyarrow" (multithreaded Arrow reader, needs pyarrow)
+    CSV_PARSE_ENGINE: str = os.getenv("CSV_PARSE_ENGINE", "pandas").lower()
+    # Keep Arrow-backed dtypes instead of converting to NumPy when the pyarrow engine is used
+    CSV_ARROW_DTYPES: bool = os.getenv("CSV_ARROW_DTYPES", "false").lower() == "true"
+    # Text columns with at most this many distinct values, and at most this share of
+    # distinct values among non-null rows, are stored as pandas category dtype
+    CATEGORY_MAX_UNIQUE: int = int(os.getenv("CATEGORY_MAX_UNIQUE", "1000"))
+    CATEGORY_MAX_UNIQUE_RATIO: float = float(os.getenv("CATEGORY_MAX_UNIQUE_RATIO", "0.5"))
+    # Downcast numeric columns and use compact extension dtypes after cleaning
+    OPTIMIZE_DTYPES: bool = os.getenv("OPTIMIZE_DTYPES", "false").lower() == "true"
+    # Missing-value imputation: median, mean, zero or none for numeric columns;
+    # mode, constant (IMPUTE_FILL_VALUE) or none for text and categorical columns
+    IMPUTE_NUMERIC_STRATEGY: str = os.getenv("IMPUTE_NUMERIC_STRATEGY", "median")
+    IMPUTE_CATEGORICAL_STRATEGY: str = os.getenv("IMPUTE_CATEGORICAL_STRATEGY", "mode")
+    IMPUTE_FILL_VALUE: str = os.getenv("IMPUTE_FILL_VALUE", "Unknown")
+    # Column profiling runs on a pool ("thread" or "process") for frames with at
+    # least COLUMN_ANALYSIS_MIN_COLUMNS columns; process workers receive NumPy
+    # columns of at least SHARED_MEMORY_MIN_BYTES through shared memory
+    COLUMN_ANALYSIS_WORKERS: int = int(os.getenv("COLUMN_ANALYSIS_WORKERS", "4"))
+    COLUMN_ANALYSIS_EXECUTOR: str = os.getenv("COLUMN_ANALYSIS_EXECUTOR", "thread")
+    COLUMN_ANALYSIS_MIN_COLUMNS: int = int(os.getenv("COLUMN_ANALYSIS_MIN_COLUMNS", "32"))
+    SHARED_MEMORY_MIN_BYTES: int = int(os.getenv("SHARED_MEMORY_MIN_BYTES", str(1024 * 1024)))
+    # Datasets with at least this many rows get sketch-based (approximate) column statistics,
+    # profiled in parallel row partitions of at least ROW_PARTITION_MIN_CELLS values (rows x
+    # columns) each, enough to amortize starting a worker process
+    APPROXIMATE_MIN_ROWS: int = int(os.getenv("APPROXIMATE_MIN_ROWS", "1000000"))
+    ROW_PARTITION_MIN_CELLS: int = int(os.getenv("ROW_PARTITION_MIN_CELLS", "10000000"))
+    # Categorical statistics list this many values; the rest are summed into other_count
+    TOP_VALUES_LIMIT: int = int(os.getenv("TOP_VALUES_LIMIT", "20"))
+    # Line and scatter suggestions kept per chart type, most correlated pairs first
+    VISUALIZATION_PAIR_LIMIT: int = int(os.getenv("VISUALIZATION_PAIR_LIMIT", "20"))
+    # Sampled profiling: types and quality heuristics come from a seeded reservoir
+    # sample of PROFILE_SAMPLE_SIZE rows; PROFILE_EXACT_STATISTICS (comma-separated:
+    # missing, cardinality, numeric, value_counts, dates) are still computed on every row
+    PROFILE_SAMPLING: bool = os.getenv("PROFILE_SAMPLING", "false").lower() == "true"
+    PROFILE_SAMPLE_SIZE: int = int(os.getenv("PROFILE_SAMPLE_SIZE", "10000"))
+    PROFILE_SAMPLE_SEED: int = int(os.getenv("PROFILE_SAMPLE_SEED", "0"))
+    PROFILE_EXACT_STATISTICS: List[str] = field(default_factory=lambda: [
+        name.strip() for name in os.getenv("PROFILE_EXACT_STATISTICS", "missing").split(",") if name.strip()
+    ])
+    # Worksheets of one workbook probed concurrently when picking the sheet to analyze
+    EXCEL_MAX_WORKERS: int = int(os.getenv("EXCEL_MAX_WORKERS", "4"))
     
     # CORS
     CORS_ORIGINS: List[str] = field(default_factory=lambda: os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000,http://localhost:5173").split(","))
@@ -77,9 +135,12 @@ class Settings:
         # Ensure file storage directories exist
         os.makedirs(self.FILE_UPLOADS_DIR, exist_ok=True)
         os.makedirs(self.FILE_PROCESSED_DIR, exist_ok=True)
+        os.makedirs(self.DATASET_CACHE_DIR, exist_ok=True)
+        os.makedirs(self.PROFILE_CHECKPOINT_DIR, exist_ok=True)
         os.makedirs(self.FILE_TEMP_DIR, exist_ok=True)
         os.makedirs(self.FILE_METADATA_UPLOADS_DIR, exist_ok=True)
         os.makedirs(self.FILE_METADATA_DASHBOARDS_DIR, exist_ok=True)
+        os.makedirs(self.FILE_METADATA_HASHES_DIR, exist_ok=True)
         
         # Ensure logs directory exists
         log_dir = os.path.dirname(self.LOG_FILE)
@@ -0,0 +1,63 @@
+"""
+Tests for compressed uploads.
+"""
+
+import gzip
+import io
+import zipfile
+import pytest
+from app.core.analytics import CSVProcessor
+from app.utils.compression import CompressedBuffer, split_extension
+from app.utils.file_handler import FileHandler
+from werkzeug.datastructures import FileStorage
+
+
+CSV_CONTENT = b"region,revenue\n" + b"".join(b"R%d,%d\n" % (i % 3, i) for i in range(500))
+
+
+def _zip(name, content):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_split_extension():
+    assert split_extension("sales.csv.gz") == ("csv", "gzip")
+    assert split_extension("sales.CSV") == ("csv", None)
+    assert split_extension("export.zip") == ("", "zip")
+
+
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+def test_gzip_csv_is_parsed_from_stream(engine):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    result = CSVProcessor(parse_engine=engine).process_upload(gzip.compress(CSV_CONTENT), "sales.csv.gz")
+
+    assert result["success"]
+    assert result["metadata"]["compression"] == "gzip"
+    assert result["metadata"]["rows_processed"] == 500
+
+
+def test_zip_member_format_and_prefix_reads():
+    content = _zip("export/data.csv", CSV_CONTENT)
+    source = CompressedBuffer(memoryview(content), "zip")
+
+    assert source.data_extension == "csv"
+    assert source[:14] == b"region,revenue"
+    assert CSVProcessor().process_upload(content, "export.zip")["metadata"]["rows_processed"] == 500
+
+
+def test_validate_file_limits_decompressed_size(monkeypatch):
+    info = FileHandler.validate_file(FileStorage(io.BytesIO(gzip.compress(CSV_CONTENT)), "sales.csv.gz"))
+    assert info["extension"] == "csv.gz"
+    assert info["uncompressed_size"] == len(CSV_CONTENT)
+
+    info = FileHandler.validate_file(FileStorage(io.BytesIO(_zip("data.json", b"[]")), "export.zip"))
+    assert info["extension"] == "json.zip"
+
+    monkeypatch.setattr(FileHandler, "MAX_FILE_SIZE", len(CSV_CONTENT) - 1)
+    with pytest.raises(ValueError, match="Decompressed file too large"):
+        FileHandler.validate_file(FileStorage(io.BytesIO(gzip.compress(CSV_CONTENT)), "sales.csv.gz"))
+    result = CSVProcessor().process_upload(gzip.compress(CSV_CONTENT), "sales.csv.gz")
+    assert not result["success"]
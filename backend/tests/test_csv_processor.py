@@ -1,4 +1,12 @@
-from app.core.analytics import CSVProcessor
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+from app.core.analytics import CSVProcessor, convert_numpy_types
+from app.core.column_stats import ColumnProfile, top_counts
+from config.settings import settings
 
 def test_csv_upload():
     processor = CSVProcessor()
@@ -22,5 +30,487 @@ def test_csv_upload():
     print("\n--- Processing Stats ---")
     print(result["processing_stats"])
 
+def test_sniffed_dialect_reported_in_metadata():
+    processor = CSVProcessor()
+    content = b"Monthly export\n\nregion;revenue\nEast;100\nWest;250\n"
+    result = processor.process_upload(content, "export.csv")
+
+    assert result["success"]
+    metadata = result["metadata"]
+    assert metadata["separator"] == ";"
+    assert metadata["dialect"]["header_row"] == 2
+    assert metadata["dialect"]["has_header"] is True
+    assert metadata["sniff_time"] >= 0
+    assert set(result["column_analysis"]) == {"region", "revenue"}
+
+def test_sniffing_only_inspects_sample(monkeypatch):
+    import app.core.analytics as analytics
+
+    processor = CSVProcessor()
+    monkeypatch.setattr(analytics, "SNIFF_SAMPLE_SIZE", 64)
+    content = b"a,b\n" + b"".join(b"%d,x%d\n" % (i, i) for i in range(1000)) + "caf\xe9,y\n".encode("cp1252")
+    df = processor._read_csv_smart(content)
+
+    assert len(df) == 1001
+    assert processor.processing_stats["encoding"] == "cp1252"
+
+def test_streaming_mode_matches_in_memory_structure(monkeypatch):
+    import app.core.analytics as analytics
+
+    monkeypatch.setattr(analytics.settings, "STREAMING_CHUNK_ROWS", 7)
+    rows = ["region,revenue,order_date"] + [
+        f"{['East', 'West'][i % 2]},{i * 10},2024-01-{i % 28 + 1:02d}" for i in range(40)
+    ]
+    content = ("\n".join(rows + rows[1:3]) + "\n").encode()
+
+    in_memory = CSVProcessor().process_upload(content, "sales.csv", streaming=False)
+    streamed = CSVProcessor().process_upload(content, "sales.csv", streaming=True)
+
+    assert streamed["success"]
+    assert streamed["metadata"]["chunks_processed"] == 6
+    assert set(streamed) == set(in_memory)
+    assert set(streamed["column_analysis"]) == set(in_memory["column_analysis"])
+    assert streamed["data_quality"]["total_rows"] == 40
+    assert streamed["data_quality"]["duplicate_rows"] == 2
+    for col, info in in_memory["column_analysis"].items():
+        assert streamed["column_analysis"][col]["type"] == info["type"]
+        assert streamed["column_analysis"][col]["cardinality"] == info["cardinality"]
+    revenue = streamed["column_analysis"]["revenue"]["statistics"]
+    expected = in_memory["column_analysis"]["revenue"]["statistics"]
+    for key in ("mean", "std", "min", "max"):
+        assert abs(revenue[key] - expected[key]) < 1e-9
+    assert streamed["column_analysis"]["region"]["statistics"]["top_values"] == {"East": 20, "West": 20}
+
+def test_pyarrow_engine_returns_arrow_backed_frame():
+    pytest.importorskip("pyarrow")
+    processor = CSVProcessor(parse_engine="pyarrow", arrow_dtypes=True)
+    df = processor._read_csv_smart(b"region,revenue\nEast,1200\nWest,300\n")
+
+    assert processor.processing_stats["parse_engine"] == "pyarrow"
+    assert str(df["revenue"].dtype) == "int64[pyarrow]"
+    result = processor.process_upload(b"region,revenue\nEast,\"$1,200\"\nWest,$300\n", "sales.csv")
+    assert result["column_analysis"]["revenue"]["type"] == "numeric"
+
+    rows = "".join(f"{['East', 'West'][i % 2]},{i * 3 + i % 5},2024-01-{i + 1:02d}\n" for i in range(28))
+    dated = processor.process_upload(("region,amt,day\n" + rows).encode(), "daily.csv")
+    assert dated["success"], dated["errors"]
+    assert dated["column_analysis"]["day"]["type"] == "date"
+    assert [chart["x_axis"] for chart in dated["visualization_suggestions"] if chart["type"] == "line_chart"] == ["day"]
+
+def test_pyarrow_engine_falls_back_to_pandas(monkeypatch):
+    pyarrow = pytest.importorskip("pyarrow")
+    processor = CSVProcessor(parse_engine="pyarrow")
+
+    def reject(*args, **kwargs):
+        raise pyarrow.lib.ArrowInvalid("CSV parse error")
+
+    monkeypatch.setattr(processor, "_parse_csv_arrow", reject)
+    df = processor._read_csv_smart(b"a,b\n1,2\n")
+
+    assert list(df.columns) == ["a", "b"]
+    assert processor.processing_stats["parse_engine"] == "pandas"
+    assert "ArrowInvalid" in processor.processing_stats["parse_engine_fallback"]
+
+def test_process_upload_accepts_file_buffer_and_reports_peak_memory():
+    import tempfile
+
+    content = ("name,city\n" + "Jos\u00e9,M\u00fcnchen\nAna,Lisboa\n" * 50).encode("utf-8")
+    with tempfile.SpooledTemporaryFile(max_size=16) as upload:
+        upload.write(content)
+        upload.seek(0)
+        result = CSVProcessor().process_upload(upload, "people.csv", streaming=False)
+
+    assert result["success"]
+    assert result["data_preview"][0]["city"] == "M\u00fcnchen"
+    assert set(result["metadata"]["peak_memory"]) == {"baseline_rss_mb", "peak_rss_mb", "peak_delta_mb"}
+
+def test_seen_row_hashes_merge_matches_set_semantics():
+    rng = np.random.default_rng(3)
+    seen_hashes, seen = np.empty(0, dtype=np.uint64), set()
+    for _ in range(20):
+        hashes = rng.integers(0, 500, size=60).astype(np.uint64)
+        duplicate, seen_hashes = CSVProcessor._mark_seen_hashes(hashes, seen_hashes)
+        expected = []
+        for value in hashes.tolist():
+            expected.append(value in seen)
+            seen.add(value)
+        assert duplicate.tolist() == expected
+        assert seen_hashes.tolist() == sorted(seen)
+
+def _workbook_bytes(openpyxl, sheets, stale=()):
+    """Save {title: rows} as .xlsx, rewriting the stored dimension of `stale` sheets to A1."""
+    import io
+    import zipfile
+
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets.items():
+        worksheet = workbook.create_sheet(title)
+        for row in rows:
+            worksheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    if not stale:
+        return buffer.getvalue()
+    stale_parts = {f"xl/worksheets/sheet{list(sheets).index(title) + 1}.xml" for title in stale}
+    rewritten = io.BytesIO()
+    with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(rewritten, "w") as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename in stale_parts:
+                data = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="A1"', data)
+            target.writestr(item, data)
+    return rewritten.getvalue()
+
+def test_excel_upload_lists_sheets_and_preview_caps_rows(monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    from app.utils.excel_reader import ExcelReader
+
+    sales_rows = [["Region", "Revenue"]] + [["East" if i % 2 else "West", i * 10] for i in range(40)]
+    content = _workbook_bytes(openpyxl, {"Notes": [], "Sales": sales_rows})
+
+    read = []
+    read_sheet = ExcelReader.read_sheet
+    monkeypatch.setattr(settings, "EXCEL_MAX_WORKERS", 2)
+    monkeypatch.setattr(ExcelReader, "read_sheet", lambda buffer, sheet=None, nrows=None, extension="xlsx":
+                        read.append((sheet, nrows)) or read_sheet(buffer, sheet, nrows, extension))
+    result = CSVProcessor().process_upload(content, "sales.xlsx")
+
+    assert result["success"]
+    assert result["metadata"]["sheet_name"] == "Sales"
+    assert result["metadata"]["sheets"] == [
+        {"name": "Notes", "rows": 0, "columns": 0},
+        {"name": "Sales", "rows": 40, "columns": 2},
+    ]
+    # Every sheet is probed for a few rows; only the analyzed one is read in full
+    assert sorted(read, key=repr) == [("Notes", 20), ("Sales", 20), ("Sales", None)]
+    assert result["metadata"]["rows_processed"] == 40
+
+    preview = ExcelReader.read_sheet(memoryview(content), "Sales", nrows=5)
+    assert list(preview.columns) == ["Region", "Revenue"]
+    assert preview["Revenue"].tolist() == [0, 10, 20, 30, 40]
+
+def test_excel_sheets_with_stale_dimension_records_are_not_skipped():
+    openpyxl = pytest.importorskip("openpyxl")
+    from app.utils.excel_reader import ExcelReader
+
+    rows = [["Region", "Revenue"]] + [["East", i] for i in range(30)]
+    content = _workbook_bytes(openpyxl, {"Export": rows, "Other": rows[:3]}, stale=["Export"])
+    assert ExcelReader._recorded_rows(memoryview(content), "xlsx")["Export"] == 0
+
+    assert ExcelReader.survey_sheets(memoryview(content)) == [
+        {"name": "Export", "rows": None, "columns": 2},
+        {"name": "Other", "rows": 2, "columns": 2},
+    ]
+    result = CSVProcessor().process_upload(content, "export.xlsx")
+    assert result["metadata"]["sheet_name"] == "Export"
+    assert result["metadata"]["rows_processed"] == 30
+
+def test_numeric_coercion_is_sample_gated_and_locale_aware(monkeypatch):
+    processor = CSVProcessor()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("textual column should not be parsed")
+
+    names = pd.Series(["Alice", "Bob", None, "Carol"] * 100, dtype=object)
+    monkeypatch.setattr(processor, "_parse_numeric_strings", fail)
+    assert processor._convert_string_numbers(names) is names
+    monkeypatch.undo()
+
+    us = pd.Series(["$1,200", "300", "45%", "$2,500.50"], dtype=object)
+    european = pd.Series(["1.234,56", "12,5", "\u20ac 7,10"], dtype=object)
+    assert processor._convert_string_numbers(us).tolist() == [1200, 300, 45, 2500.5]
+    assert processor._convert_string_numbers(european).tolist() == [1234.56, 12.5, 7.1]
+
+def test_phone_numbers_and_codes_stay_text():
+    rows = "".join(f"{phone},{i}\n" for i, phone in
+                   enumerate(["555 123 4567", "+1 555 987 6543", "020 7946 0958", "0044 20 7946 0000"] * 10))
+    processor = CSVProcessor()
+    df = processor._clean_and_normalize(processor._read_csv_smart(("phone,n\n" + rows).encode()))
+    assert df["phone"].astype(str).tolist()[:3] == ["555 123 4567", "+1 555 987 6543", "020 7946 0958"]
+
+    grouped = pd.Series(["1 234 567", "1'234.5", "12 000"], dtype=object)
+    assert processor._convert_string_numbers(grouped).tolist() == [1234567, 1234.5, 12000]
+
+    codes = pd.Series(["007", "012", "123", "450"] * 5, dtype=object)
+    assert processor._convert_string_numbers(codes) is codes
+
+def test_signed_values_convert_without_losing_positives():
+    processor = CSVProcessor()
+    percentages = pd.Series(["+11.01%", "-0.3%", "-2.5%", "+4%", "-1%"], dtype=object)
+    assert processor._convert_string_numbers(percentages).tolist() == [11.01, -0.3, -2.5, 4, -1]
+
+    rows = "".join(f"{change},{i}\n" for i, change in enumerate(["+12", "-3", "+7", "0", "-15"] * 8))
+    df = processor._clean_and_normalize(processor._read_csv_smart(("change,n\n" + rows).encode()))
+    assert df["change"].tolist()[:5] == [12, -3, 7, 0, -15]
+
+def test_low_cardinality_text_columns_become_categoricals():
+    rows = "".join(f"{region},customer{i},{i}\n" for i, region in enumerate(["East", "West", "East", "North"] * 10))
+    processor = CSVProcessor()
+    df = processor._clean_and_normalize(processor._read_csv_smart(("region,name,amount\n" + rows).encode()))
+
+    assert isinstance(df["region"].dtype, pd.CategoricalDtype)
+    assert list(df["region"].cat.categories) == ["East", "North", "West"]
+    assert df["name"].dtype == object
+    assert "encoded_categorical_columns" in processor.processing_stats["cleaning_applied"]
+
+    profile = ColumnProfile.from_series(df["region"][df["region"] != "North"])
+    stats = processor._calculate_column_statistics(profile, "categorical")
+    assert stats["value_counts"] == {"East": 20, "West": 10}
+
+def test_optimize_dtypes_downcasts_and_reports_savings():
+    rows = "".join(f"{i % 100},{i * 0.5},{'' if i % 7 == 0 else i}\n" for i in range(200))
+    content = ("small,half,gappy\n" + rows).encode()
+
+    assert "memory_optimization" not in CSVProcessor().process_upload(content, "m.csv")["metadata"]
+
+    processor = CSVProcessor(optimize_dtypes=True)
+    df = processor._clean_and_normalize(processor._read_csv_smart(content))
+    assert str(df["small"].dtype) == "int8"
+    assert str(df["half"].dtype) == "float32"
+    assert str(df["gappy"].dtype) == "int16"
+
+    report = processor.processing_stats["memory_optimization"]
+    assert report["after_bytes"] < report["before_bytes"]
+    assert report["columns"]["small"] == {"from": "int64", "to": "int8", "before_bytes": 1600, "after_bytes": 200}
+
+    assert str(CSVProcessor._downcast_series(pd.Series([1.0, None, 3.0])).dtype) == "Int8"
+    assert str(CSVProcessor._downcast_series(pd.Series([True, None], dtype=object)).dtype) == "boolean"
+
+    # encode_categoricals runs first and turns True/False text into a two-category categorical
+    flags = "".join(f"{i},{['True', 'False'][i % 2] if i % 7 else ''},{['yes', 'no'][i % 2]}\n" for i in range(60))
+    df = processor._clean_and_normalize(processor._read_csv_smart(("id,active,flag\n" + flags).encode()))
+    assert str(df["active"].dtype) == "boolean"
+    assert str(df["flag"].dtype) == "category"
+
+def test_row_hashes_shared_by_deduplication_and_quality(monkeypatch):
+    # Rows 3 and 4 only become equal once the missing value is imputed
+    content = b"a,b\n1,x\n1,x\n2,y\n2,\n2,y\n3,y\n"
+    processor = CSVProcessor()
+    df = processor._clean_and_normalize(processor._read_csv_smart(content))
+    assert "removed_duplicate_rows" in processor.processing_stats["cleaning_applied"]
+
+    row_hashes = processor.data_cache["row_hashes"]
+    assert list(row_hashes) == list(CSVProcessor._row_hashes(df))
+
+    monkeypatch.setattr(pd.DataFrame, "drop_duplicates", lambda *args, **kwargs: pytest.fail("rehashed frame"))
+    quality = processor._assess_data_quality(df, {})
+    assert quality["duplicate_rows"] == 1
+
+def test_cleaning_reports_peak_memory_per_stage():
+    content = b"a,b,empty\n1,x,\n,,\n1,x,\n2,,\n"
+    result = CSVProcessor().process_upload(content, "s.csv")
+    assert result["metadata"]["rows_processed"] == 2
+    assert "removed_empty_rows_columns" in result["metadata"]["cleaning_applied"]
+
+    stage_memory = result["metadata"]["stage_memory"]
+    assert list(stage_memory) == ["drop_empty", "convert_numbers", "parse_dates", "encode_categoricals",
+                                  "deduplicate", "handle_missing_values"]
+    assert all(stage["peak_rss_mb"] >= stage["baseline_rss_mb"] for stage in stage_memory.values())
+
+def test_batched_imputation_uses_configured_strategies():
+    df = pd.DataFrame({
+        "amount": [1.0, None, 3.0, 10.0],
+        "region": pd.Categorical(["b", "a", None, "a"]),
+        "name": ["x", None, "y", "y"],
+    })
+
+    filled = CSVProcessor()._handle_missing_values(df.copy())
+    assert filled["amount"].tolist() == [1.0, 3.0, 3.0, 10.0]
+    assert filled["region"].tolist() == ["b", "a", "a", "a"]
+    assert filled["name"].tolist() == ["x", "y", "y", "y"]
+
+    processor = CSVProcessor(impute_strategies={"numeric": "mean", "categorical": "constant"})
+    filled = processor._handle_missing_values(df.copy())
+    assert filled["amount"].tolist() == [1.0, 14.0 / 3, 3.0, 10.0]
+    assert filled["region"].tolist() == ["b", "a", "Unknown", "a"]
+
+    untouched = CSVProcessor(impute_strategies={"numeric": "none"})._handle_missing_values(df.copy())
+    assert untouched["amount"].isna().sum() == 1
+
+    with pytest.raises(ValueError):
+        CSVProcessor(impute_strategies={"numeric": "mode"})
+
+def test_date_columns_parsed_once_with_inferred_format(monkeypatch):
+    rows = "".join(f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d},{i % 28 + 1:02d}/{i % 12 + 1:02d}/2023,{i}\n"
+                   for i in range(60))
+    content = ("created,shipped,amount\n" + rows).encode()
+    processor = CSVProcessor()
+    df = processor._clean_and_normalize(processor._read_csv_smart(content))
+    assert processor.data_cache["date_formats"] == {"created": "%Y-%m-%d", "shipped": "%d/%m/%Y"}
+    assert str(df["created"].dtype) == "datetime64[ns]"
+
+    # Analysis reuses the typed columns instead of parsing again
+    monkeypatch.setattr(pd, "to_datetime", lambda *args, **kwargs: pytest.fail("reparsed dates"))
+    analysis = processor._analyze_columns(df)
+    assert analysis["shipped"]["type"] == "date"
+    assert analysis["shipped"]["statistics"]["min_date"] == "2023-01-01 00:00:00"
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("full_value_counts", [False, True])
+def test_parallel_column_analysis_matches_sequential(monkeypatch, executor, full_value_counts):
+    monkeypatch.setattr(settings, "COLUMN_ANALYSIS_MIN_COLUMNS", 2)
+    monkeypatch.setattr(settings, "SHARED_MEMORY_MIN_BYTES", 0)
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    df = pd.DataFrame({
+        "revenue": [10.5, 20.0, None, 40.25] * 125,
+        "units": list(range(500)),
+        "region": pd.Categorical(["north", "south", "east", "west"] * 125),
+        "segment": [f"s{i % 40}" for i in range(500)],
+        "customer": [f"c{i}" for i in range(500)],
+        "created": pd.date_range("2024-01-01", periods=500, freq="D"),
+    })
+
+    sequential = CSVProcessor(analysis_workers=1, full_value_counts=full_value_counts)._analyze_columns(df)
+    parallel = CSVProcessor(analysis_workers=2, analysis_executor=executor,
+                            full_value_counts=full_value_counts)._analyze_columns(df)
+    assert convert_numpy_types(parallel) == convert_numpy_types(sequential)
+    expected = 40 if full_value_counts else settings.TOP_VALUES_LIMIT
+    assert len(parallel["segment"]["statistics"]["value_counts"]) == expected
+
+def test_approximate_mode_switches_on_above_row_threshold(monkeypatch):
+    rows = "".join(f"{i % 500},{i * 0.25},r{i % 7}\n" for i in range(3000))
+    content = ("units,amount,region\n" + rows).encode()
+
+    exact = CSVProcessor().process_upload(content, "a.csv")
+    assert exact["metadata"]["approximate"] is False
+    assert "error_bounds" not in exact["column_analysis"]["amount"]
+
+    monkeypatch.setattr(settings, "APPROXIMATE_MIN_ROWS", 1000)
+    result = CSVProcessor().process_upload(content, "a.csv")
+    assert result["metadata"]["approximate"] is True
+    amount = result["column_analysis"]["amount"]
+    bounds = amount["error_bounds"]
+    assert set(bounds) == {"distinct_count_relative_error", "top_values_max_undercount", "quantile_rank_error"}
+    assert amount["statistics"]["mean"] == pytest.approx(exact["column_analysis"]["amount"]["statistics"]["mean"])
+    assert abs(amount["statistics"]["median"] - 374.875) <= 750 * bounds["quantile_rank_error"]
+    assert result["column_analysis"]["region"]["statistics"]["value_counts"] == \
+        exact["column_analysis"]["region"]["statistics"]["value_counts"]
+
+def test_categorical_value_counts_are_capped_at_top_k(monkeypatch):
+    monkeypatch.setattr(settings, "TOP_VALUES_LIMIT", 3)
+    # Category c<i> appears i + 1 times
+    rows = "".join(f"c{i},{n}\n" for i in range(40) for n in range(i + 1))
+    content = ("code,n\n" + rows).encode()
+
+    stats = CSVProcessor().process_upload(content, "k.csv")["column_analysis"]["code"]["statistics"]
+    assert list(stats["value_counts"].items()) == [("c39", 40), ("c38", 39), ("c37", 38)]
+    assert stats["other_count"] == 820 - 117
+    assert stats["distinct_count"] == 40
+
+    full = CSVProcessor(full_value_counts=True).process_upload(content, "k.csv")["column_analysis"]["code"]["statistics"]
+    assert len(full["value_counts"]) == 40
+    assert full["other_count"] == 0
+
+    counts = pd.Series([5, 9, 5, 1, 9], index=list("abcde"))
+    assert list(top_counts(counts, 3).items()) == [("b", 9), ("e", 9), ("a", 5)]
+
+def test_sampled_profiling_is_reproducible_with_exact_fallback():
+    df = pd.DataFrame({
+        "amount": [float(i % 997) if i % 50 else None for i in range(5000)],
+        "region": [f"r{i % 7}" for i in range(5000)],
+    })
+
+    first = CSVProcessor(sampling=True, sample_size=500, sample_seed=7)
+    sampled = first._analyze_columns(df)
+    again = CSVProcessor(sampling=True, sample_size=500, sample_seed=7)._analyze_columns(df)
+    assert convert_numpy_types(sampled) == convert_numpy_types(again)
+    assert first.processing_stats["sampling"] == {"sample_size": 500, "seed": 7, "exact_statistics": ["missing"]}
+    assert sampled["amount"]["type"] == "numeric"
+    assert sampled["amount"]["missing_count"] == 100
+    assert sum(sampled["region"]["statistics"]["value_counts"].values()) == pytest.approx(5000, abs=7)
+
+    exact = CSVProcessor()._analyze_columns(df)
+    mixed = CSVProcessor(sampling=True, sample_size=500, exact_statistics=["numeric"])._analyze_columns(df)
+    assert mixed["amount"]["statistics"] == exact["amount"]["statistics"]
+    assert mixed["amount"]["cardinality"] == exact["amount"]["cardinality"]
+
+    with pytest.raises(ValueError):
+        CSVProcessor(exact_statistics=["everything"])
+
+def test_scatter_and_line_suggestions_are_ranked_and_capped(monkeypatch):
+    monkeypatch.setattr(settings, "VISUALIZATION_PAIR_LIMIT", 2)
+    x = [float(i) for i in range(200)]
+    df = pd.DataFrame({
+        "day": pd.date_range("2024-01-01", periods=200, freq="D"),
+        "noise": [float((i * 37) % 11) for i in range(200)],
+        "sales": [v * 2 + (i % 3) for i, v in enumerate(x)],
+        "units": [v if i % 10 else None for i, v in enumerate(x)],
+        "flat": [1.0] * 200,
+    })
+    info = {col: {"type": "date" if col == "day" else "numeric"} for col in df.columns}
+
+    suggestions = CSVProcessor()._suggest_visualizations(info, [], df)
+    scatter = [(s["x_axis"], s["y_axis"]) for s in suggestions if s["type"] == "scatter_plot"]
+    lines = [s["y_axis"] for s in suggestions if s["type"] == "line_chart"]
+    assert len(scatter) == 2 and scatter[0] == ("sales", "units")
+    assert all("flat" not in pair for pair in scatter)
+    assert sorted(lines) == ["sales", "units"]
+    assert len([s for s in suggestions if s["type"] == "histogram"]) == 4
+
+def test_line_suggestions_handle_offset_timestamps():
+    rows = "".join(f"2024-03-{1 + i % 28:02d}T08:00:00+02:00,{i * 1.5}\n" for i in range(60))
+    content = ("recorded_at,reading\n" + rows + ",7\n").encode()
+
+    result = CSVProcessor().process_upload(content, "tz.csv")
+    assert result["success"], result["errors"]
+    assert result["column_analysis"]["recorded_at"]["type"] == "date"
+    lines = [s for s in result["visualization_suggestions"] if s["type"] == "line_chart"]
+    assert [(s["x_axis"], s["y_axis"]) for s in lines] == [("recorded_at", "reading")]
+
+def test_row_partitioned_profile_matches_sequential_exact_statistics(monkeypatch):
+    df = pd.DataFrame({
+        "amount": [float((i * 37) % 1001) if i % 11 else None for i in range(6000)],
+        "units": [i % 17 for i in range(6000)],
+        "region": pd.Categorical([f"r{i % 6}" for i in range(6000)]),
+        "channel": [("web", "store", "phone")[i % 3] for i in range(6000)],
+        "created": pd.date_range("2024-01-01", periods=6000, freq="h"),
+    })
+    sequential = CSVProcessor(approximate=True)._analyze_columns(df)
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(settings, "ROW_PARTITION_MIN_CELLS", 10000)
+    processor = CSVProcessor(approximate=True, analysis_workers=2)
+    assert processor._row_partitions(6000, 5) == [(0, 3000), (3000, 6000)]
+    assert processor._row_partitions(1500, 5) == [(0, 1500)]
+    partitioned = processor._analyze_columns(df)
+    assert processor.processing_stats["row_partitions"] == 2
+
+    for col, info in sequential.items():
+        merged = partitioned[col]
+        for key in ("type", "cardinality", "missing_count", "unique_values"):
+            assert merged[key] == info[key]
+        for key in ("mean", "std", "min", "max"):
+            if key in info["statistics"]:
+                assert merged["statistics"][key] == pytest.approx(info["statistics"][key])
+        for key in ("value_counts", "other_count", "min_date", "max_date"):
+            if key in info["statistics"]:
+                assert merged["statistics"][key] == info["statistics"][key]
+
+def test_streamed_chunks_are_profiled_on_a_process_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_CHECKPOINT_DIR", str(tmp_path))
+    rows = "".join(f"{i},{(i * 37) % 1001}.25,{('web', 'store', 'phone')[i % 3]},2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}\n"
+                   for i in range(2 * settings.STREAMING_CHUNK_ROWS + 500))
+    content = ("id,amount,channel,created\n" + rows).encode()
+    sequential = CSVProcessor(analysis_workers=1).process_upload(content, "orders.csv", streaming=True)
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    pooled = CSVProcessor(analysis_workers=2).process_upload(content, "orders.csv", streaming=True)
+    assert pooled["success"], pooled["errors"]
+    assert pooled["metadata"]["row_partitions"] == 3
+    assert "row_partitions" not in sequential["metadata"]
+
+    assert pooled["data_quality"] == sequential["data_quality"]
+    for col, info in sequential["column_analysis"].items():
+        merged = pooled["column_analysis"][col]
+        for key in ("type", "cardinality", "missing_count"):
+            assert merged[key] == info[key]
+        for key in ("mean", "std", "min", "max"):
+            if key in info["statistics"]:
+                assert merged["statistics"][key] == pytest.approx(info["statistics"][key])
+        for key in ("value_counts", "min_date", "max_date"):
+            if key in info["statistics"]:
+                assert merged["statistics"][key] == info["statistics"][key]
+
 if __name__ == "__main__":
     test_csv_upload()
@@ -0,0 +1,104 @@
+"""
+Tests for the columnar dataset cache.
+"""
+
+import os
+import pytest
+from app.core.analytics import CSVProcessor
+from app.utils.dataset_cache import DatasetCache
+from app.utils.file_handler import FileHandler
+from config.settings import settings
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    for attr in ("FILE_UPLOADS_DIR", "FILE_METADATA_UPLOADS_DIR", "DATASET_CACHE_DIR"):
+        path = tmp_path / attr.lower()
+        path.mkdir()
+        monkeypatch.setattr(settings, attr, str(path))
+    return tmp_path
+
+
+def _store_upload(fileID, content):
+    path = FileHandler.get_upload_path(fileID, "csv")
+    with open(path, "wb") as f:
+        f.write(content)
+    FileHandler.save_upload_metadata(fileID, {"fileID": fileID, "filename": "sales.csv", "ext": "csv"})
+    return path
+
+
+def test_process_upload_populates_cache_and_load_reads_columns(storage, monkeypatch):
+    content = b'Region,Revenue\nEast,"$1,200"\nWest,300\n'
+    _store_upload("f1", content)
+    result = CSVProcessor().process_upload(content, "sales.csv", file_id="f1")
+    assert result["metadata"]["dataset_cached"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("source should not be reparsed")
+
+    processor = CSVProcessor()
+    monkeypatch.setattr(processor, "_smart_read_file", fail)
+    df = processor.load_dataset("f1", columns=["revenue"])
+
+    assert list(df.columns) == ["revenue"]
+    assert df["revenue"].tolist() == [1200, 300]
+
+
+def test_cache_rebuilt_when_source_changes(storage):
+    path = _store_upload("f2", b"a,b\n1,2\n")
+    processor = CSVProcessor()
+    assert processor.load_dataset("f2")["a"].tolist() == [1]
+    first_path = DatasetCache.get_manifest("f2")["path"]
+
+    with open(path, "wb") as f:
+        f.write(b"a,b\n5,6\n7,8\n")
+    os.utime(path, ns=(0, 0))
+
+    assert processor.load_dataset("f2")["a"].tolist() == [5, 7]
+    assert DatasetCache.get_manifest("f2")["path"] != first_path
+    assert not os.path.exists(first_path)
+
+    assert FileHandler.delete_upload_set("f2")
+    assert DatasetCache.get_manifest("f2") is None
+
+
+def test_memory_mapped_reads(storage):
+    content = b"a,b\n1,2\n3,4\n"
+    _store_upload("f3", content)
+    assert b"".join(FileHandler.iter_upload_range(FileHandler.map_upload("f3"), 4, 8)) == b"1,2\n"
+
+    processor = CSVProcessor()
+    processor.load_dataset("f3")
+    df = DatasetCache.load("f3", columns=["b"], arrow_backed=True)
+    assert str(df["b"].dtype).endswith("[pyarrow]")
+    assert df["b"].tolist() == [2, 4]
+
+
+def test_preview_reads_raw_rows_until_analysis_fills_cache(storage, monkeypatch):
+    from app.api.routes import analyze
+    from app.main import create_app
+
+    processed = storage / "processed"
+    processed.mkdir()
+    monkeypatch.setattr(settings, "FILE_PROCESSED_DIR", str(processed))
+    monkeypatch.setattr(analyze.llm_service, "process_file", lambda fileID, meta: {"fileID": fileID})
+    _store_upload("f4", b"Region,Revenue\nEast,100\nWest,\nNorth,200\n")
+    client = create_app().test_client()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("preview should not clean the whole upload")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(CSVProcessor, "_clean_and_normalize", fail)
+        raw = client.get("/api/v1/files/preview/f4").get_data(as_text=True)
+    assert "Region" in raw and "NaN" in raw
+    assert DatasetCache.get_manifest("f4") is None
+
+    analyze._process_file_background("f4", FileHandler.get_upload_metadata("f4"))
+    assert DatasetCache.get_manifest("f4")["rows"] == 3
+    # The manifest carries the upload's stat, so the preview does not rehash it
+    monkeypatch.setattr(DatasetCache, "hash_file", lambda path: pytest.fail("rehashed upload"))
+    cached = client.get("/api/v1/files/preview/f4").get_data(as_text=True)
+    assert "region" in cached and "NaN" not in cached
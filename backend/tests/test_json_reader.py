@@ -0,0 +1,39 @@
+"""
+Tests for streaming JSON and JSON Lines reading.
+"""
+
+import json
+from app.utils import json_reader
+from app.utils.json_reader import JSONReader
+
+
+def test_array_is_streamed_across_blocks_and_flattened(monkeypatch):
+    monkeypatch.setattr(json_reader, "READ_BLOCK_SIZE", 16)
+    records = [{"id": i, "customer": {"name": f"c{i}", "address": {"city": "Oslo"}}, "tags": ["a"], "amount": 12345}
+               for i in range(10)]
+    df = JSONReader.read(memoryview(json.dumps(records).encode()))
+
+    assert list(df.columns) == ["id", "customer.name", "customer.address.city", "tags", "amount"]
+    assert df["id"].tolist() == list(range(10))
+    assert df["amount"].tolist() == [12345] * 10
+    assert df["tags"].iloc[0] == '["a"]'
+
+
+def test_json_lines_batches_and_row_cap():
+    content = b"\n".join(json.dumps({"n": i, "meta": {"ok": i % 2 == 0}}).encode() for i in range(25))
+
+    assert JSONReader.detect_format(memoryview(content), "json") == "lines"
+    batches = list(JSONReader.iter_batches(memoryview(content), batch_rows=10, extension="jsonl"))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert list(batches[0].columns) == ["n", "meta.ok"]
+
+    preview = JSONReader.read(memoryview(content), nrows=3, extension="ndjson")
+    assert preview["n"].tolist() == [0, 1, 2]
+
+
+def test_single_document_shapes():
+    wrapped = b'{"count": 2, "data": [{"x": 1}, {"x": 2}]}'
+    columns = b'{"a": [1, 2], "b": [3, 4]}'
+
+    assert JSONReader.read(memoryview(wrapped))["x"].tolist() == [1, 2]
+    assert JSONReader.read(memoryview(columns)).to_dict("list") == {"a": [1, 2], "b": [3, 4]}
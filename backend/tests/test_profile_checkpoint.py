@@ -0,0 +1,92 @@
+"""
+Tests for incremental reanalysis of appended CSV exports.
+"""
+
+import pytest
+from app.core.analytics import CSVProcessor
+from app.utils.profile_checkpoint import APPEND_HEAD_BYTES, ProfileCheckpoint
+from config.settings import settings
+
+
+@pytest.fixture
+def checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "STREAMING_CHUNK_ROWS", 1000)
+    return tmp_path
+
+
+def _rows(start, stop):
+    return "".join(f"{i},{(i * 7) % 101}.5,r{i % 4},{'' if i % 9 == 0 else i % 13}\n" for i in range(start, stop))
+
+
+def _profile(content):
+    return CSVProcessor().process_upload(content, "export.csv", streaming=True)
+
+
+def test_appended_export_only_profiles_new_rows(checkpoints, monkeypatch):
+    day1 = ("id,amount,region,score\n" + _rows(0, 5000)).encode()
+    day2 = day1 + _rows(5000, 5600).encode() + _rows(0, 3).encode()
+    day3 = day2 + _rows(5600, 6000).encode()
+    assert len(day1) > APPEND_HEAD_BYTES
+
+    assert "incremental" not in _profile(day1)["metadata"]
+    second = _profile(day2)
+    assert second["metadata"]["incremental"] == {
+        "previous_rows": 5000, "appended_rows": 600, "resumed_at_byte": len(day1)
+    }
+    assert second["data_quality"]["duplicate_rows"] == 3
+    third = _profile(day3)
+    assert third["metadata"]["incremental"]["previous_rows"] == 5600
+
+    monkeypatch.setattr(settings, "INCREMENTAL_ANALYSIS_ENABLED", False)
+    full = _profile(day3)
+    assert "incremental" not in full["metadata"]
+    assert third["data_quality"] == full["data_quality"]
+    for col, info in full["column_analysis"].items():
+        merged = third["column_analysis"][col]
+        assert (merged["type"], merged["missing_count"], merged["cardinality"]) == \
+            (info["type"], info["missing_count"], info["cardinality"])
+        for key in ("mean", "std", "min", "max"):
+            if key in info["statistics"]:
+                assert merged["statistics"][key] == pytest.approx(info["statistics"][key])
+    assert third["column_analysis"]["region"]["statistics"]["value_counts"] == \
+        full["column_analysis"]["region"]["statistics"]["value_counts"]
+
+
+def test_changed_prefix_or_partial_row_is_not_an_append(checkpoints):
+    day1 = ("id,amount,region,score\n" + _rows(0, 5000)).encode()
+    _profile(day1)
+
+    edited = day1[:-20] + b"9" + day1[-19:] + _rows(5000, 5100).encode()
+    assert ProfileCheckpoint.find_append(memoryview(edited)) is None
+    assert ProfileCheckpoint.find_append(memoryview(day1[:-1] + b"7\n")) is None
+    assert ProfileCheckpoint.find_append(memoryview(day1 + _rows(5000, 5001).encode()))[1] == len(day1)
+
+    reprocessed = _profile(edited)
+    assert "incremental" not in reprocessed["metadata"]
+    assert reprocessed["metadata"]["rows_processed"] == 5100
+
+
+def test_checkpoints_are_removed_with_upload_and_evicted_over_budget(checkpoints, tmp_path, monkeypatch):
+    from app.utils.file_handler import FileHandler
+    for attr in ("FILE_UPLOADS_DIR", "FILE_METADATA_UPLOADS_DIR", "DATASET_CACHE_DIR"):
+        path = tmp_path / attr.lower()
+        path.mkdir()
+        monkeypatch.setattr(settings, attr, str(path))
+
+    first = ("id,amount,region,score\n" + _rows(0, 5000)).encode()
+    second = ("id,amount,region,score\n" + _rows(1, 5001)).encode()
+    _profile(first)
+    _profile(second)
+    assert len(list(checkpoints.glob("*.pkl"))) == 2
+
+    with open(FileHandler.get_upload_path("f1", "csv"), "wb") as f:
+        f.write(second)
+    FileHandler.save_upload_metadata("f1", {"fileID": "f1", "filename": "export.csv", "ext": "csv"})
+    assert FileHandler.delete_upload_set("f1")
+    assert ProfileCheckpoint.find_append(memoryview(second + _rows(5001, 5002).encode())) is None
+    assert ProfileCheckpoint.find_append(memoryview(first + _rows(5000, 5001).encode())) is not None
+
+    monkeypatch.setattr(settings, "PROFILE_CHECKPOINT_MAX_MB", 0)
+    _profile(second)
+    assert [str(path) for path in checkpoints.glob("*.pkl")] == [ProfileCheckpoint._get_path(memoryview(second))]
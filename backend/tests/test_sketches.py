@@ -0,0 +1,50 @@
+"""
+Tests for the mergeable profiling sketches.
+"""
+
+import numpy as np
+import pandas as pd
+from app.core.sketches import FrequentItems, HyperLogLog, KLLSketch
+
+
+class TestSketches:
+    """Test cases for streaming sketches."""
+
+    def test_kll_quantiles_within_rank_error(self):
+        values = np.random.default_rng(0).permutation(100000).astype(float)
+        sketch = KLLSketch(k=200)
+        for chunk in np.array_split(values, 10):
+            sketch.update(chunk)
+
+        tolerance = 2 * sketch.normalized_rank_error * len(values)
+        for q, estimate in zip((0.25, 0.5, 0.75), sketch.quantiles([0.25, 0.5, 0.75])):
+            assert abs(estimate - q * len(values)) < tolerance
+
+    def test_kll_merge_equals_single_stream(self):
+        left, right = KLLSketch(), KLLSketch()
+        left.update(np.arange(0, 5000))
+        right.update(np.arange(5000, 10000))
+        left.merge(right)
+
+        assert left.n == 10000
+        assert abs(left.quantile(0.5) - 5000) < 10000 * 2 * left.normalized_rank_error
+
+    def test_hyperloglog_estimate(self):
+        hll = HyperLogLog(precision=12)
+        hll.update(np.arange(50000))
+        other = HyperLogLog(precision=12)
+        other.update(np.arange(25000, 75000))
+        hll.merge(other)
+
+        assert abs(hll.estimate() - 75000) / 75000 < 4 * hll.relative_error
+
+    def test_frequent_items_exact_until_capacity(self):
+        items = FrequentItems(capacity=10)
+        items.update(pd.Series(['a'] * 5 + ['b'] * 3 + ['c']))
+        assert items.exact
+        assert items.top(2) == {'a': 5, 'b': 3}
+
+        items.update(pd.Series([f'v{i}' for i in range(50)] + ['a'] * 100))
+        assert not items.exact
+        assert next(iter(items.top(1))) == 'a'
+        assert 105 - items.error_bound <= items.counters['a'] <= 105
@@ -0,0 +1,67 @@
+"""
+Tests for content-hash deduplication of uploads.
+"""
+
+import io
+import os
+import pytest
+from app.main import create_app
+from app.utils.file_handler import FileHandler
+from config.settings import settings
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    for attr in ("FILE_UPLOADS_DIR", "FILE_PROCESSED_DIR", "FILE_TEMP_DIR", "FILE_METADATA_UPLOADS_DIR",
+                 "FILE_METADATA_HASHES_DIR", "DATASET_CACHE_DIR"):
+        path = tmp_path / attr.lower()
+        path.mkdir()
+        monkeypatch.setattr(settings, attr, str(path))
+    return create_app().test_client()
+
+
+def _upload(client, content, filename="sales.csv"):
+    response = client.post("/api/v1/files/upload", data={"file": (io.BytesIO(content), filename)},
+                           content_type="multipart/form-data")
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_identical_upload_reuses_stored_file(client):
+    first = _upload(client, b"region,revenue\nEast,100\n")
+    second = _upload(client, b"region,revenue\nEast,100\n", "copy.csv")
+    other = _upload(client, b"region,revenue\nWest,200\n")
+
+    assert first["deduplicated"] is False
+    assert second["deduplicated"] is True
+    assert second["fileID"] == first["fileID"]
+    assert other["fileID"] != first["fileID"]
+    assert len(os.listdir(settings.FILE_UPLOADS_DIR)) == 2
+    assert os.listdir(settings.FILE_TEMP_DIR) == []
+
+
+def test_deleting_upload_clears_hash_index(client):
+    first = _upload(client, b"a,b\n1,2\n")
+    content_hash = FileHandler.get_upload_metadata(first["fileID"])["content_hash"]
+    assert FileHandler.find_upload_by_hash(content_hash)["fileID"] == first["fileID"]
+
+    assert client.delete(f"/api/v1/files/{first['fileID']}").status_code == 200
+    assert FileHandler.find_upload_by_hash(content_hash) is None
+    assert _upload(client, b"a,b\n1,2\n")["deduplicated"] is False
+
+
+def test_raw_download_streams_full_file_and_ranges(client, monkeypatch):
+    monkeypatch.setattr(FileHandler, "SAVE_BLOCK_SIZE", 4)
+    content = b"region,revenue\nEast,100\nWest,200\n"
+    fileID = _upload(client, content)["fileID"]
+
+    full = client.get(f"/api/v1/files/raw/{fileID}")
+    assert full.status_code == 200 and full.is_streamed
+    assert full.headers["Content-Length"] == str(len(content))
+    assert full.data == content
+
+    part = client.get(f"/api/v1/files/raw/{fileID}", headers={"Range": "bytes=15-23"})
+    assert part.status_code == 206
+    assert part.headers["Content-Range"] == f"bytes 15-23/{len(content)}"
+    assert part.data == b"East,100\n"
+    assert client.get(f"/api/v1/files/raw/{fileID}", headers={"Range": "bytes=500-"}).status_code == 416
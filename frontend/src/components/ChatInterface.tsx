@@ -284,8 +284,8 @@ const ChatInterface = ({ messages, onMessagesChange, onProcessedDataChange }: Ch
     const sizeLimit = 50 * 1024 * 1024;
     if (file.size > sizeLimit) return "File too large. Maximum size: 50MB";
     const ext = file.name.split('.').pop()?.toLowerCase();
-    const allowed = ["csv","xlsx","xls","json"];
-    if (!ext || !allowed.includes(ext)) return "Invalid file type. Supported: CSV, XLSX, XLS, JSON";
+    const allowed = ["csv","xlsx","xls","json","jsonl","ndjson","gz","zst","zip"];
+    if (!ext || !allowed.includes(ext)) return "Invalid file type. Supported: CSV, XLSX, XLS, JSON, JSONL (optionally .gz, .zst or .zip)";
     return null;
   };
 
@@ -539,7 +539,7 @@ const ChatInterface = ({ messages, onMessagesChange, onProcessedDataChange }: Ch
         <input
           ref={fileInputRef}
           type="file"
-          accept=".csv,.json,.xlsx,.xls"
+          accept=".csv,.json,.jsonl,.ndjson,.xlsx,.xls,.gz,.zst,.zip"
           className="hidden"
           onChange={async (e) => {
             const file = e.target.files?.[0];